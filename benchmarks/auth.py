@@ -0,0 +1,78 @@
+"""Compare the per-request authentication latency of both access token modes.
+
+Fills a SQLite database with ``--tokens`` tokens and times ``--requests``
+authenticated ``GET /users/me`` requests, first with access tokens looked up
+in the token table and then with stateless access tokens. The token cache is
+disabled so that every request authenticates from scratch. Run it from the
+repository root:
+
+    python -m benchmarks.auth --tokens 100000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from src import create_app, db
+from src.models import Token, User
+
+
+def run(stateless, tokens, requests):
+    database = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database.name}',
+        'ACCESS_TOKEN_STATELESS': stateless,
+        'TOKEN_CACHE_SIZE': 0,
+        'TOKEN_REAPER_INTERVAL': 0,
+        'PASSWORD_HASH_WORKERS': 0,
+    })
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@bench.com', password='bench')
+        db.session.add(user)
+        db.session.flush()
+        expiration = datetime.now() + timedelta(days=1)
+        db.session.execute(db.insert(Token), [{
+            'user_id': user.id,
+            'access_token': f'access{i}',
+            'access_expiration': expiration,
+            'refresh_token': f'refresh{i}',
+            'refresh_expiration': expiration,
+        } for i in range(tokens)])
+        token = user.generate_auth_token()
+        db.session.add(token)
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {token.access_token_jwt}'}
+
+    client = app.test_client()
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get('api/v1/users/me', headers=headers)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+
+    os.unlink(database.name)
+    return {
+        'mode': 'stateless' if stateless else 'token table',
+        'median_ms': statistics.median(latencies) * 1000,
+        'p95_ms': statistics.quantiles(latencies, n=20)[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tokens', type=int, default=10000, help='tokens in the token table')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per mode')
+    args = parser.parse_args()
+
+    print(f'{"mode":>12} {"median ms":>10} {"p95 ms":>10}')
+    for stateless in (False, True):
+        result = run(stateless, args.tokens, args.requests)
+        print(f'{result["mode"]:>12} {result["median_ms"]:>10.3f} {result["p95_ms"]:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Microbenchmarks of the cost calculations.
+
+Each calculation runs against a project with 10, 1,000 and 100,000 members,
+tasks and products, comparing the row by row ORM path with the set-based
+query that the app uses. Needs pytest-benchmark; the file is named so that
+the regular test run does not collect it:
+
+    pytest benchmarks/bench_costs.py --benchmark-autosave
+    pytest benchmarks/bench_costs.py --benchmark-compare --benchmark-compare-fail=mean:10%
+
+The second command fails when a benchmark got more than 10% slower than the
+last saved run.
+"""
+from datetime import date
+
+import pytest
+
+from src import db
+from src.models import Member, Product, ProjectCostSummary, Task
+from src.sql import months_between
+
+SIZES = [10, 1000, 100000]
+
+# past this size the row by row paths issue too many queries to be worth timing
+ORM_MAX_ROWS = 10000
+
+
+@pytest.fixture(scope='module', params=SIZES, ids=lambda size: f'{size}_rows')
+def project_size(request):
+    return request.param
+
+
+def rows(project):
+    return db.session.query(Member).filter_by(project_id=project.id).count()
+
+
+def skip_large(project):
+    if rows(project) > ORM_MAX_ROWS:
+        pytest.skip(f'row by row path issues one query per row, skipped above {ORM_MAX_ROWS} rows')
+
+
+def test_project_total_months(benchmark, project):
+    benchmark(project.total_months)
+
+
+def test_task_total_months_orm(benchmark, project):
+    tasks = db.session.scalars(db.select(Task).where(Task.project_id == project.id)).all()
+    benchmark(lambda: [task.total_months() for task in tasks])
+
+
+def test_task_total_months_sql(benchmark, project):
+    query = db.select(months_between(Task.created_at, Task.deadline)).where(Task.project_id == project.id)
+    benchmark(lambda: db.session.scalars(query).all())
+
+
+def member_cost_python(member):
+    """Cost of a member from its lazily loaded tasks, computed in Python as before the grouped query."""
+    longest_task = date.today()
+    longest_task_months = 0
+    for task in member.tasks:
+        if task.deadline > longest_task:
+            longest_task = task.deadline
+            longest_task_months = task.total_months()
+    return member.salary * longest_task_months
+
+
+def test_member_costs_orm(benchmark, project):
+    skip_large(project)
+    members = project.members
+
+    def calc():
+        for member in members:
+            db.session.expire(member, ['tasks'])
+        return [member_cost_python(member) for member in members]
+
+    costs = benchmark(calc)
+    assert costs == [row['total_cost'] for row in Member.calc_costs_for_all_members(project.id)]
+
+
+def test_member_costs_per_member_sql(benchmark, project):
+    # calc_total_cost runs the grouped query once for each member
+    skip_large(project)
+    members = project.members
+    benchmark(lambda: [member.calc_total_cost() for member in members])
+
+
+def test_member_costs_sql(benchmark, project):
+    benchmark(Member.calc_costs_for_all_members, project.id)
+
+
+def test_products_by_type_orm(benchmark, project):
+    def calc():
+        db.session.expire(project, ['products'])
+        return Product.calc_total_costs_by_type(project.id)
+
+    benchmark(calc)
+
+
+def test_products_by_license_sql(benchmark, project):
+    benchmark(Product.calc_total_costs_by_license, project.id)
+
+
+def test_cost_summary_sql(benchmark, project):
+    benchmark(ProjectCostSummary.calc, project.id)
+
+
+def test_update_budget(benchmark, project):
+    benchmark(project.update_budget)
+
+
+def test_apply_cost_delta(benchmark, project):
+    benchmark(project.apply_cost_delta, members=0)
@@ -0,0 +1,65 @@
+"""Microbenchmarks of the JSON providers.
+
+Serializes lists of 100 and 10,000 dumped projects, with their decimal
+totals, dates and nested members, products and tasks, using Flask's default
+provider and the orjson provider (``JSON_PROVIDER``). Needs pytest-benchmark:
+
+    pytest benchmarks/bench_json.py --benchmark-group-by=func,param:projects --benchmark-columns=mean,ops
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from src import create_app
+from src.json_provider import JSON_PROVIDERS
+from src.models import Member, Product, Project, Task, User
+from src.schemas import ProjectSchema
+
+SIZES = [100, 10000]
+
+
+@pytest.fixture(scope='module')
+def app():
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'TOKEN_REAPER_INTERVAL': 0,
+        'PASSWORD_HASH_WORKERS': 0,
+    })
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture(scope='module', params=SIZES, ids=lambda size: f'{size}_projects')
+def projects(request, app):
+    """``size`` dumped projects, each with three members, products and tasks."""
+    today = date.today()
+    owner = User(id=1, username='bench', email='bench@bench.com')
+    projects = []
+    for i in range(1, request.param + 1):
+        projects.append(Project(
+            id=i, name_project=f'project{i}', description_project='benchmark project', owner=owner, user_id=1,
+            created_at=today, deadline=today + timedelta(days=365), expected_budget=Decimal('150000.00'),
+            budget=Decimal(f'{i * 1000}.75'), total_cost_members=Decimal(f'{i * 900}.50'),
+            total_cost_products=Decimal(f'{i * 100}.25'),
+            members=[Member(id=i * 3 + j, name_member=f'member{i}-{j}') for j in range(3)],
+            products=[Product(id=i * 3 + j, name_product=f'product{i}-{j}') for j in range(3)],
+            tasks=[Task(id=i * 3 + j, name_task=f'task{i}-{j}') for j in range(3)],
+        ))
+    return ProjectSchema(many=True).dump(projects)
+
+
+@pytest.mark.parametrize('provider', JSON_PROVIDERS)
+def test_dumps(benchmark, app, projects, provider):
+    if provider != 'default' and JSON_PROVIDERS[provider] is DefaultJSONProvider:
+        pytest.skip(f'{provider} is not installed')
+    benchmark(JSON_PROVIDERS[provider](app).dumps, projects)
+
+
+@pytest.mark.parametrize('provider', JSON_PROVIDERS)
+def test_response(benchmark, app, projects, provider):
+    if provider != 'default' and JSON_PROVIDERS[provider] is DefaultJSONProvider:
+        pytest.skip(f'{provider} is not installed')
+    benchmark(JSON_PROVIDERS[provider](app).response, projects)
@@ -0,0 +1,58 @@
+"""Microbenchmarks of the compiled schema dumps.
+
+Dumps pages of members, tasks and products, and a project with all of its
+rows nested, with ``SCHEMA_COMPILED_DUMP`` disabled (marshmallow) and
+enabled (the functions compiled by `src.serializers.compile_dump`). The rows
+are loaded once, so only the serialization is timed. Needs pytest-benchmark:
+
+    pytest benchmarks/bench_serializers.py --benchmark-group-by=func,param:project_size --benchmark-columns=mean,ops
+"""
+import pytest
+from flask import current_app
+
+from src import db
+from src.loading import eager_load
+from src.models import Member, Product, Project, Task
+from src.schemas import MemberSchema, ProductSchema, ProjectSchema, TaskSchema
+
+SIZES = [25, 1000]
+
+DUMPS = ['marshmallow', 'compiled']
+
+
+@pytest.fixture(scope='module', params=SIZES, ids=lambda size: f'{size}_rows')
+def project_size(request):
+    return request.param
+
+
+def load(schema, model, project):
+    return db.session.scalars(db.select(model).where(model.project_id == project.id)
+                              .options(*eager_load(schema))).all()
+
+
+@pytest.fixture(params=DUMPS)
+def dump(request, project):
+    current_app.config['SCHEMA_COMPILED_DUMP'] = request.param == 'compiled'
+    yield lambda schema: lambda rows: schema.dump(rows, many=True)
+    current_app.config['SCHEMA_COMPILED_DUMP'] = True
+
+
+def test_dump_members(benchmark, project, dump):
+    schema = MemberSchema()
+    benchmark(dump(schema), load(schema, Member, project))
+
+
+def test_dump_tasks(benchmark, project, dump):
+    schema = TaskSchema()
+    benchmark(dump(schema), load(schema, Task, project))
+
+
+def test_dump_products(benchmark, project, dump):
+    schema = ProductSchema()
+    benchmark(dump(schema), load(schema, Product, project))
+
+
+def test_dump_project(benchmark, project, dump):
+    schema = ProjectSchema()
+    db.session.expire(project)
+    benchmark(dump(schema), [db.session.get(Project, project.id, options=eager_load(schema))])
@@ -0,0 +1,54 @@
+"""Fixtures shared by the microbenchmarks.
+
+Each benchmark module sets the sizes of the `project` fixture with a
+module-scoped ``project_size`` fixture.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from src import create_app, db
+from src.models import Member, Product, Project, Task, User, task_member
+
+
+@pytest.fixture(scope='module')
+def project(project_size):
+    """A project with ``project_size`` members, tasks and products; each member works on two tasks."""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'TOKEN_REAPER_INTERVAL': 0,
+        'PASSWORD_HASH_WORKERS': 0,
+    })
+    ctx = app.app_context()
+    ctx.push()
+    db.create_all()
+
+    today = date.today()
+    db.session.add(User(id=1, username='bench', email='bench@bench.com', password_hash=''))
+    db.session.add(Project(id=1, name_project='bench', user_id=1, deadline=today + timedelta(days=365)))
+    db.session.flush()
+    db.session.execute(db.insert(Task), [{
+        'id': i, 'name_task': f'task{i}', 'project_id': 1, 'created_at': today,
+        'deadline': today + timedelta(days=30 + i % 300),
+    } for i in range(1, project_size + 1)])
+    db.session.execute(db.insert(Member), [{
+        'id': i, 'name_member': f'member{i}', 'role': 'developer', 'salary': 1000 + i % 5000, 'project_id': 1,
+    } for i in range(1, project_size + 1)])
+    db.session.execute(task_member.insert(), [
+        {'member_id': i, 'task_id': task_id}
+        for i in range(1, project_size + 1) for task_id in {i, i % project_size + 1}
+    ])
+    db.session.execute(db.insert(Product), [{
+        'id': i, 'name_product': f'product{i}', 'cost': 10 + i % 1000, 'amount': 1 + i % 10,
+        'license': i % 2 == 0, 'type': ('HARDWARE', 'SOFTWARE', 'OTHER')[i % 3], 'project_id': 1,
+    } for i in range(1, project_size + 1)])
+    db.session.commit()
+    db.session.get(Project, 1).update_budget()
+    db.session.commit()
+
+    yield db.session.get(Project, 1)
+
+    db.session.remove()
+    db.drop_all()
+    ctx.pop()
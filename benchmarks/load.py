@@ -0,0 +1,274 @@
+"""Load test the REST API against a synthetic dataset.
+
+Seeds a SQLite database (or ``--database``) with ``--users`` users, each
+owning ``--projects`` projects with ``--members`` members, ``--tasks`` tasks
+and ``--products`` products, and assigns every member to ``--links`` tasks.
+The application is then served by waitress and ``--clients`` threads run each
+scenario for ``--seconds`` seconds over keep-alive connections. The
+throughput and latency percentiles of every scenario are printed and saved
+as JSON, so that the results of two commits can be compared:
+
+    python -m benchmarks.load --output before.json
+    git checkout other-branch
+    python -m benchmarks.load --output after.json --compare before.json
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from base64 import b64encode
+from datetime import date, datetime, timedelta
+from http.client import HTTPConnection
+
+from waitress.server import create_server
+
+from src import create_app, db
+from src.extensions import password_hasher
+from src.models import Member, Product, Project, ProjectCostSummary, Task, User, task_member
+
+PASSWORD = 'bench-password'
+
+
+def seed(app, args):
+    """Insert the synthetic dataset and return the project ids of every user."""
+    today = date.today()
+    with app.app_context():
+        db.create_all()
+        password_hash = password_hasher.hash(PASSWORD)
+        db.session.execute(db.insert(User), [{
+            'id': user_id, 'username': f'user{user_id}', 'email': f'user{user_id}@bench.com',
+            'password_hash': password_hash,
+        } for user_id in range(1, args.users + 1)])
+
+        projects = {}
+        project_id = member_id = task_id = product_id = 0
+        for user_id in range(1, args.users + 1):
+            for _ in range(args.projects):
+                project_id += 1
+                projects.setdefault(user_id, []).append(project_id)
+                db.session.execute(db.insert(Project), [{
+                    'id': project_id, 'name_project': f'project{project_id}', 'user_id': user_id,
+                    'deadline': today + timedelta(days=365), 'expected_budget': 1000000,
+                }])
+                task_ids = list(range(task_id + 1, task_id + args.tasks + 1))
+                task_id += args.tasks
+                if task_ids:
+                    db.session.execute(db.insert(Task), [{
+                        'id': i, 'name_task': f'task{i}', 'project_id': project_id,
+                        'deadline': today + timedelta(days=30 + i % 300),
+                    } for i in task_ids])
+                member_ids = list(range(member_id + 1, member_id + args.members + 1))
+                member_id += args.members
+                if member_ids:
+                    db.session.execute(db.insert(Member), [{
+                        'id': i, 'name_member': f'member{i}', 'role': 'developer', 'salary': 1000 + i % 5000,
+                        'project_id': project_id,
+                    } for i in member_ids])
+                links = [{'member_id': member, 'task_id': task_ids[(member + n) % len(task_ids)]}
+                         for member in member_ids for n in range(min(args.links, len(task_ids)))]
+                if links:
+                    db.session.execute(task_member.insert(), links)
+                product_ids = range(product_id + 1, product_id + args.products + 1)
+                product_id += args.products
+                if args.products:
+                    db.session.execute(db.insert(Product), [{
+                        'id': i, 'name_product': f'product{i}', 'cost': 10 + i % 1000, 'amount': 1 + i % 10,
+                        'license': i % 2 == 0, 'type': ('HARDWARE', 'SOFTWARE', 'OTHER')[i % 3],
+                        'project_id': project_id,
+                    } for i in product_ids])
+        db.session.commit()
+
+        for project in db.session.scalars(db.select(Project)):
+            ProjectCostSummary.mark_stale(project.id)
+            project.update_budget()
+        db.session.commit()
+    return projects
+
+
+class Client:
+    """A keep-alive HTTP connection authenticated as one of the seeded users."""
+
+    def __init__(self, port, user_id, project_ids):
+        self.connection = HTTPConnection('127.0.0.1', port)
+        self.user_id = user_id
+        self.project_ids = project_ids
+        self.credentials = 'Basic ' + b64encode(f'user{user_id}:{PASSWORD}'.encode()).decode()
+        self.access_token = self.refresh_token = None
+        self.login()
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.access_token and 'Authorization' not in headers:
+            headers['Authorization'] = f'Bearer {self.access_token}'
+        if body is not None:
+            body = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        self.connection.request(method, '/api/v1/' + path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        data = response.read()
+        return response.status, data
+
+    def login(self):
+        status, data = self.request('POST', 'tokens', headers={'Authorization': self.credentials})
+        if status == 200:
+            tokens = json.loads(data)
+            self.access_token, self.refresh_token = tokens['access_token'], tokens['refresh_token']
+        return status
+
+    def refresh(self):
+        status, data = self.request('PUT', 'tokens', body={
+            'access_token': self.access_token, 'refresh_token': self.refresh_token})
+        if status == 200:
+            tokens = json.loads(data)
+            self.access_token, self.refresh_token = tokens['access_token'], tokens['refresh_token']
+        return status
+
+    @property
+    def project(self):
+        return self.project_ids[0]
+
+
+def new_member(client):
+    return client.request('POST', f'projects/{client.project}/members', body={
+        'name_member': f'member-{uuid.uuid4()}', 'role': 'developer', 'salary': 1500})[0]
+
+
+def new_product(client):
+    return client.request('POST', f'projects/{client.project}/products', body={
+        'name_product': f'product-{uuid.uuid4()}', 'cost': 100, 'amount': 2, 'license': True,
+        'type': 'SOFTWARE'})[0]
+
+
+SCENARIOS = {
+    'login': Client.login,
+    'refresh': Client.refresh,
+    'list_projects': lambda client: client.request('GET', 'projects')[0],
+    'get_project': lambda client: client.request('GET', f'projects/{client.project}')[0],
+    'members_costs': lambda client: client.request('GET', f'projects/{client.project}/members_costs')[0],
+    'products_by_license': lambda client: client.request('GET', f'projects/{client.project}/products_by_license')[0],
+    'products_by_type': lambda client: client.request('GET', f'projects/{client.project}/products_by_type')[0],
+    'new_member': new_member,
+    'new_product': new_product,
+}
+
+
+def run_scenario(scenario, clients, seconds):
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + seconds
+
+    def work(client):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = scenario(client)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+
+    threads = [threading.Thread(target=work, args=(client,)) for client in clients]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'requests_per_second': round(len(latencies) / elapsed, 2),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'p50_ms': round(percentiles[49] * 1000, 3),
+        'p95_ms': round(percentiles[94] * 1000, 3),
+        'p99_ms': round(percentiles[98] * 1000, 3),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    print(f'\n{"scenario":>20} {"req/s":>16} {"p95 ms":>18}')
+    for name, result in results['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if before is None:
+            continue
+        rps = (result['requests_per_second'] / before['requests_per_second'] - 1) * 100 \
+            if before['requests_per_second'] else 0
+        p95 = (result['p95_ms'] / before['p95_ms'] - 1) * 100 if before['p95_ms'] else 0
+        print(f'{name:>20} {result["requests_per_second"]:>8.1f} ({rps:+5.1f}%) {result["p95_ms"]:>9.2f} ({p95:+5.1f}%)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', help='database URI to seed (defaults to a temporary SQLite file)')
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--projects', type=int, default=2, help='projects per user')
+    parser.add_argument('--members', type=int, default=50, help='members per project')
+    parser.add_argument('--tasks', type=int, default=20, help='tasks per project')
+    parser.add_argument('--products', type=int, default=50, help='products per project')
+    parser.add_argument('--links', type=int, default=5, help='tasks assigned to each member')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent clients')
+    parser.add_argument('--threads', type=int, default=8, help='waitress threads')
+    parser.add_argument('--seconds', type=float, default=5, help='duration of each scenario')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--output', default='benchmark-results.json', help='file to save the results to')
+    parser.add_argument('--compare', help='results file of a previous run to compare against')
+    args = parser.parse_args()
+    logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+
+    database = None
+    if args.database is None:
+        database = tempfile.NamedTemporaryFile(suffix='.db', delete=False).name
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': args.database or f'sqlite:///{database}',
+        'REFRESH_TOKEN_IN_BODY': True,
+        'TOKEN_REAPER_INTERVAL': 0,
+    })
+    projects = seed(app, args)
+
+    server = create_server(app, host='127.0.0.1', port=0, threads=args.threads)
+    threading.Thread(target=server.run, daemon=True).start()
+    clients = [Client(server.effective_port, user_id, projects[user_id])
+               for user_id in (i % args.users + 1 for i in range(args.clients))]
+
+    results = {
+        'commit': git_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'dataset': {key: getattr(args, key) for key in ('users', 'projects', 'members', 'tasks', 'products', 'links')},
+        'settings': {'clients': args.clients, 'threads': args.threads, 'seconds': args.seconds},
+        'scenarios': {},
+    }
+    print(f'{"scenario":>20} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"errors":>7}')
+    for name in args.scenarios:
+        result = run_scenario(SCENARIOS[name], clients, args.seconds)
+        results['scenarios'][name] = result
+        print(f'{name:>20} {result["requests_per_second"]:>8.1f} {result["p50_ms"]:>8.2f} '
+              f'{result["p95_ms"]:>8.2f} {result["p99_ms"]:>8.2f} {result["errors"]:>7}')
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+    # the server thread is a daemon and goes away with the process
+    server.task_dispatcher.shutdown()
+    if database is not None:
+        os.unlink(database)
+
+
+if __name__ == '__main__':
+    main()
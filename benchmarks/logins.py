@@ -0,0 +1,114 @@
+"""Measure logins per second with different password hashing pool sizes.
+
+Starts the application under waitress with a SQLite database, then keeps
+``--clients`` threads logging in through ``POST /tokens`` while another thread
+requests ``GET /users/me`` to show how much the logins slow down the rest of
+the server. Run it from the repository root:
+
+    python -m benchmarks.logins --workers 0 1 2 4
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+from base64 import b64encode
+from urllib.request import Request, urlopen
+
+from waitress.server import create_server
+
+from src import create_app, db
+from src.models import User
+
+
+def login(url, authorization):
+    request = Request(url + 'api/v1/tokens', method='POST', headers={'Authorization': authorization})
+    with urlopen(request) as response:
+        response.read()
+
+
+def get_me(url, access_token):
+    request = Request(url + 'api/v1/users/me', headers={'Authorization': f'Bearer {access_token}'})
+    start = time.perf_counter()
+    with urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run(workers, method, clients, seconds, threads):
+    database = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database.name}',
+        'PASSWORD_HASH_METHOD': method,
+        'PASSWORD_HASH_WORKERS': workers,
+        'REFRESH_TOKEN_IN_BODY': True,
+    })
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username='bench', email='bench@bench.com', password='bench'))
+        db.session.commit()
+
+    server = create_server(app, host='127.0.0.1', port=0, threads=threads)
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    url = f'http://127.0.0.1:{server.effective_port}/'
+    authorization = 'Basic ' + b64encode(b'bench:bench').decode()
+
+    request = Request(url + 'api/v1/tokens', method='POST', headers={'Authorization': authorization})
+    with urlopen(request) as response:
+        access_token = json.loads(response.read())['access_token']
+
+    logins = []
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    def login_client():
+        count = 0
+        while time.perf_counter() < deadline:
+            login(url, authorization)
+            count += 1
+        logins.append(count)
+
+    def latency_client():
+        while time.perf_counter() < deadline:
+            latencies.append(get_me(url, access_token))
+
+    client_threads = [threading.Thread(target=login_client) for _ in range(clients)]
+    client_threads.append(threading.Thread(target=latency_client))
+    for thread in client_threads:
+        thread.start()
+    for thread in client_threads:
+        thread.join()
+
+    # the server thread is a daemon and goes away with the process
+    server.task_dispatcher.shutdown()
+    os.unlink(database.name)
+    return {
+        'workers': workers,
+        'logins_per_second': sum(logins) / seconds,
+        'other_request_ms': statistics.median(latencies) * 1000 if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4],
+                        help='password hashing pool sizes to compare (0 hashes on the request thread)')
+    parser.add_argument('--method', default='scrypt:32768:8:1', help='password hash method')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent login clients')
+    parser.add_argument('--seconds', type=float, default=10, help='duration of each run')
+    parser.add_argument('--threads', type=int, default=4, help='waitress threads')
+    args = parser.parse_args()
+    logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+
+    print(f'{"workers":>8} {"logins/s":>10} {"other request (median ms)":>26}')
+    for workers in args.workers:
+        result = run(workers, args.method, args.clients, args.seconds, args.threads)
+        print(f'{result["workers"]:>8} {result["logins_per_second"]:>10.1f} {result["other_request_ms"]:>26.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Profile the cold start of the application.
+
+Creates the app in fresh interpreters run with ``-X importtime`` and reports
+the time spent importing ``src`` and running ``create_app``, the packages
+that take the most time to import and, with ``--profile``, the functions
+that take the most time inside ``create_app``. Run it from the repository
+root:
+
+    python -m benchmarks.startup --runs 5 --profile
+"""
+import argparse
+import json
+import os
+import pstats
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+
+CHILD = '''
+import cProfile, json, sys, time
+start = time.perf_counter()
+from src import create_app
+imported = time.perf_counter()
+profile = cProfile.Profile() if sys.argv[1] else None
+if profile:
+    profile.enable()
+app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'TOKEN_REAPER_INTERVAL': 0})
+if profile:
+    profile.disable()
+    profile.dump_stats(sys.argv[1])
+created = time.perf_counter()
+print(json.dumps({'import': imported - start, 'create_app': created - imported,
+                  'alembic': 'alembic' in sys.modules}))
+'''
+
+
+def run(profile_path=''):
+    """Create the app in a new interpreter, return its timings and the import time of each package."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD, profile_path],
+                            capture_output=True, text=True, check=True, env=os.environ)
+    timings = json.loads(result.stdout.splitlines()[-1])
+    packages = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        packages[name.strip().split('.')[0]] += int(self_us)
+    return timings, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='number of cold starts to measure')
+    parser.add_argument('--top', type=int, default=15, help='number of packages and functions to list')
+    parser.add_argument('--profile', action='store_true', help='profile create_app in the last run')
+    args = parser.parse_args()
+
+    runs = []
+    packages = Counter()
+    with tempfile.TemporaryDirectory() as directory:
+        profile_path = os.path.join(directory, 'create_app.prof')
+        for i in range(args.runs):
+            timings, run_packages = run(profile_path if args.profile and i == args.runs - 1 else '')
+            runs.append(timings)
+            packages.update(run_packages)
+
+        import_ms = statistics.median(timings['import'] for timings in runs) * 1000
+        create_ms = statistics.median(timings['create_app'] for timings in runs) * 1000
+        print(f'import src (median ms)   {import_ms:>8.1f}')
+        print(f'create_app (median ms)   {create_ms:>8.1f}')
+        print(f'total (median ms)        {import_ms + create_ms:>8.1f}')
+        print(f'alembic imported         {"yes" if any(timings["alembic"] for timings in runs) else "no":>8}')
+
+        print(f'\n{"package":<30} {"import (ms)":>12}')
+        for name, total_us in packages.most_common(args.top):
+            print(f'{name:<30} {total_us / args.runs / 1000:>12.1f}')
+
+        if args.profile:
+            print()
+            pstats.Stats(profile_path).sort_stats('cumulative').print_stats(args.top)
+
+
+if __name__ == '__main__':
+    main()
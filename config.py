@@ -10,14 +10,55 @@ JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'dev'
 
 SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URI') or 'sqllite:///database.db'
 SQLALCHEMY_TRACK_MODIFICATIONS = False
+DATABASE_REPLICA_URIS = [uri.strip() for uri in (os.environ.get('DATABASE_REPLICA_URIS') or '').split(',') if uri.strip()]
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS') or '10')
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or '0')
+# unset keeps the SQLAlchemy default, -1 lets the pool overflow without limit
+DB_MAX_OVERFLOW = int(os.environ['DB_MAX_OVERFLOW']) if os.environ.get('DB_MAX_OVERFLOW') else None
+DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT') or '0')
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or '3600')
+DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING') != 'False'
+SQLALCHEMY_ENGINE_OPTIONS = {
+    'pool_pre_ping': DB_POOL_PRE_PING,
+    'pool_recycle': DB_POOL_RECYCLE,
+}
+# only set when given, the pools of SQLite in-memory databases do not take them
+if DB_POOL_SIZE:
+    SQLALCHEMY_ENGINE_OPTIONS['pool_size'] = DB_POOL_SIZE
+if DB_MAX_OVERFLOW is not None:
+    SQLALCHEMY_ENGINE_OPTIONS['max_overflow'] = DB_MAX_OVERFLOW
+if DB_POOL_TIMEOUT:
+    SQLALCHEMY_ENGINE_OPTIONS['pool_timeout'] = DB_POOL_TIMEOUT
+WSGI_THREADS = int(os.environ.get('WSGI_THREADS') or '4')
+SQL_MAX_STATEMENTS = int(os.environ.get('SQL_MAX_STATEMENTS') or '0')
+SQL_WARN_STATEMENTS = int(os.environ.get('SQL_WARN_STATEMENTS') or '0')
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS') or '0')
+SERVER_TIMING = os.environ.get('SERVER_TIMING') == 'True'
 
 ACCESS_TOKEN_MINUTES = int(os.environ.get('ACCESS_TOKEN_MINUTES') or '15')
+ACCESS_TOKEN_STATELESS = os.environ.get('ACCESS_TOKEN_STATELESS') == 'True'
 REFRESH_TOKEN_DAYS = int(os.environ.get('REFRESH_TOKEN_DAYS') or '7')
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE') or '1024')
+TOKEN_CACHE_SECONDS = int(os.environ.get('TOKEN_CACHE_SECONDS') or '0')
+TOKEN_REAPER_INTERVAL = int(os.environ.get('TOKEN_REAPER_INTERVAL') or '0')
+TOKEN_REAPER_BATCH_SIZE = int(os.environ.get('TOKEN_REAPER_BATCH_SIZE') or '1000')
 REFRESH_TOKEN_IN_COOKIE = os.environ.get('REFRESH_TOKEN_IN_COOKIE') == 'True'
 REFRESH_TOKEN_IN_BODY = os.environ.get('REFRESH_TOKEN_IN_BODY') == 'True'
 RESET_TOKEN_MINUTES = int(os.environ.get('RESET_TOKEN_MINUTES') or '15')
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt:32768:8:1'
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or os.cpu_count() or '1')
 PASSWORD_RESET_URL = os.environ.get('PASSWORD_RESET_URL') or 'http://localhost:5000/reset'
 
+PAGE_SIZE_DEFAULT = int(os.environ.get('PAGE_SIZE_DEFAULT') or '25')
+PAGE_SIZE_MAX = int(os.environ.get('PAGE_SIZE_MAX') or '100')
+STREAM_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE') or '500')
+BULK_MAX_ROWS = int(os.environ.get('BULK_MAX_ROWS') or '10000')
+SCHEMA_COMPILED_DUMP = os.environ.get('SCHEMA_COMPILED_DUMP') != 'False'
+JSON_PROVIDER = os.environ.get('JSON_PROVIDER') or 'orjson'
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE') or '500')
+COMPRESS_STREAMS = os.environ.get('COMPRESS_STREAMS') != 'False'
+COMPRESS_CACHE_SIZE = int(os.environ.get('COMPRESS_CACHE_SIZE') or '256')
+
 APIFAIRY_TITLE = 'CostWise Fitec API'
 APIFAIRY_VERSION = '1.0'
 APIFAIRY_UI = os.environ.get('APIFAIRY_UI') or 'swagger'
@@ -29,4 +70,9 @@ MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER') or 'dev@dev.com'
 MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'localhost'
 MAIL_PORT = int(os.environ.get('MAIL_PORT') or '25')
 MAIL_USE_TLS = True
+MAIL_QUEUE_WORKERS = int(os.environ.get('MAIL_QUEUE_WORKERS') or '2')
+MAIL_QUEUE_BATCH_SIZE = int(os.environ.get('MAIL_QUEUE_BATCH_SIZE') or '20')
+MAIL_QUEUE_RETRIES = int(os.environ.get('MAIL_QUEUE_RETRIES') or '3')
+MAIL_QUEUE_BACKOFF = float(os.environ.get('MAIL_QUEUE_BACKOFF') or '2')
+MAIL_QUEUE_IDLE_SECONDS = float(os.environ.get('MAIL_QUEUE_IDLE_SECONDS') or '30')
 
@@ -2,7 +2,10 @@ import warnings
 
 from flask import Flask, redirect
 
-from .extensions import db, ma, af, mail, cors
+from .extensions import db, replicas, migrate, ma, af, mail, mail_queue, cors, token_cache, password_hasher, \
+    token_reaper, instrumentation, metrics, compression
+from .json_provider import JSON_PROVIDERS
+from .pool import check_pool_size
 
 URL_PREFIX = '/api/v1/'
 
@@ -16,6 +19,8 @@ def create_app(test_config=None):
     if test_config is not None:
         app.config.from_mapping(test_config)
 
+    app.json = JSON_PROVIDERS[app.config['JSON_PROVIDER']](app)
+
     warnings.filterwarnings(
         "ignore",
         message="Multiple schemas resolved to the name ",
@@ -23,10 +28,21 @@ def create_app(test_config=None):
 
     # Extensions
     db.init_app(app)
+    replicas.init_app(app)
+    migrate.init_app(app, db)
     ma.init_app(app)
     af.init_app(app)
     mail.init_app(app)
+    mail_queue.init_app(app, mail)
     cors.init_app(app)
+    token_cache.init_app(app)
+    password_hasher.init_app(app)
+    token_reaper.init_app(app)
+    instrumentation.init_app(app)
+    metrics.init_app(app)
+    compression.init_app(app)
+    with app.app_context():
+        check_pool_size(app, db.engine)
 
     # Blueprints
     from .blueprints.errors import errors
@@ -38,6 +54,12 @@ def create_app(test_config=None):
     from .blueprints.projects import projects
     app.register_blueprint(projects, url_prefix=URL_PREFIX)
 
+    # Commands
+    from .cli import budget, summary, tokens
+    app.cli.add_command(budget)
+    app.cli.add_command(summary)
+    app.cli.add_command(tokens)
+
     @app.route('/')
     def index():  # pragma: no cover
         return redirect('/docs')
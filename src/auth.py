@@ -1,5 +1,6 @@
 from flask_httpauth import HTTPBasicAuth, HTTPTokenAuth
 
+from .extensions import db, password_hasher, replicas
 from .models import User
 
 basic_auth = HTTPBasicAuth()
@@ -11,10 +12,15 @@ def verify_password(username, password):
     if username and password:
         user = User.query.filter_by(username=username).scalar()
         if user and user.verify_password(password):
+            if password_hasher.needs_rehash(user.password_hash):
+                user.password = password
+                db.session.commit()
             return user
 
 
 @token_auth.verify_token
 def verify_token(access_token):
     if access_token:
-        return User.verify_access_token(access_token)
+        # a token can be used before it reaches the replicas
+        with replicas.primary():
+            return User.verify_access_token(access_token)
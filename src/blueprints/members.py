@@ -4,18 +4,23 @@ from apifairy import authenticate, response, body, other_responses
 from src.extensions import db
 from src.auth import token_auth
 from src.models import Member, Task, Project
-from src.schemas import MemberSchema, EmptySchema
+from src.schemas import MemberSchema, EmptySchema, BulkCreatedSchema
+from src.bulk import load_rows, bulk_insert
+from src.decorators import paginated_response, project_etag
+from src.loading import eager_load
 
 members = Blueprint('members', __name__)
 
 member_schema = MemberSchema()
 members_schema = MemberSchema(many=True)
 update_member_schema = MemberSchema(partial=True)
+bulk_created_schema = BulkCreatedSchema()
 
 
 @members.route('/members', methods=['GET'])
 @authenticate(token_auth)
-@response(members_schema, 200)
+@project_etag
+@paginated_response(members_schema)
 @other_responses({404: 'Project not found', 401: 'User not allowed'})
 def get_members(project_id):
     """Return all Members"""
@@ -23,7 +28,7 @@ def get_members(project_id):
     project = db.session.get(Project, project_id) or abort(404)
     if not project.user_id == user.id:
         abort(401)
-    return project.members
+    return db.select(Member).where(Member.project_id == project.id)
 
 
 @members.route('/members', methods=['POST'])
@@ -39,13 +44,29 @@ def new_members(args, project_id):
         abort(401)
     member = Member(project=project, **args)
     db.session.add(member)
+    db.session.flush()
+    project.apply_cost_delta(members=member.calc_total_cost())
     db.session.commit()
-    project.update_budget()
     return member
 
 
+@members.route('/members/bulk', methods=['POST'])
+@authenticate(token_auth)
+@response(bulk_created_schema, 201)
+@other_responses({400: 'Invalid rows', 404: 'Project not found', 401: 'User not allowed'})
+def new_members_bulk(project_id):
+    """Create many Members from a JSON array or a CSV file"""
+    user = token_auth.current_user()
+    project = db.session.get(Project, project_id) or abort(404)
+    if not project.user_id == user.id:
+        abort(401)
+    rows = load_rows(members_schema, unique='name_member')
+    return {'created': bulk_insert(Member, project, rows)}
+
+
 @members.route('/members/<int:member_id>', methods=['GET'])
 @authenticate(token_auth)
+@project_etag
 @response(member_schema)
 @other_responses({404: 'Project or Member not found', 401: 'User not allowed'})
 def get_member(project_id, member_id):
@@ -54,7 +75,7 @@ def get_member(project_id, member_id):
     project = db.session.get(Project, project_id) or abort(404)
     if not project.user_id == user.id:
         abort(401)
-    return db.session.get(Member, member_id) or abort(404)
+    return db.session.get(Member, member_id, options=eager_load(member_schema)) or abort(404)
 
 
 @members.route('/members/<int:member_id>', methods=['PUT'])
@@ -69,10 +90,11 @@ def update_member(data, project_id, member_id):
     if not project.user_id == user.id:
         abort(401)
     member = db.session.get(Member, member_id) or abort(404)
+    old_cost = member.calc_total_cost()
     member.update(data)
     db.session.add(member)
+    project.apply_cost_delta(members=member.calc_total_cost() - old_cost)
     db.session.commit()
-    project.update_budget()
     return member
 
 
@@ -87,9 +109,10 @@ def delete_member(project_id, member_id):
     if not project.user_id == user.id:
         abort(401)
     member = db.session.get(Member, member_id) or abort(404)
+    old_cost = member.calc_total_cost()
     db.session.delete(member)
+    project.apply_cost_delta(members=-old_cost)
     db.session.commit()
-    project.update_budget()
     return {}
 
 
@@ -108,7 +131,8 @@ def assign_task(project_id, member_id, task_id):
     task = db.session.get(Task, task_id) or abort(404)
     if member.has_task(task):
         abort(409)
+    old_cost = member.calc_total_cost()
     member.assign_task(task)
+    project.apply_cost_delta(members=member.calc_total_cost() - old_cost)
     db.session.commit()
-    project.update_budget()
     return member
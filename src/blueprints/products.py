@@ -4,18 +4,23 @@ from apifairy import authenticate, response, body, other_responses
 from src.extensions import db
 from src.auth import token_auth
 from src.models import Product, Project
-from src.schemas import ProductSchema, EmptySchema
+from src.schemas import ProductSchema, EmptySchema, BulkCreatedSchema
+from src.bulk import load_rows, bulk_insert
+from src.decorators import paginated_response, project_etag
+from src.loading import eager_load
 
 products = Blueprint('products', __name__)
 
 product_schema = ProductSchema()
 products_schema = ProductSchema(many=True)
 update_product_schema = ProductSchema(partial=True)
+bulk_created_schema = BulkCreatedSchema()
 
 
 @products.route('/products', methods=['GET'])
 @authenticate(token_auth)
-@response(products_schema)
+@project_etag
+@paginated_response(products_schema)
 @other_responses({404: 'Project not found', 401: 'User not allowed'})
 def get_products(project_id):
     """Return all Products"""
@@ -23,7 +28,7 @@ def get_products(project_id):
     project = db.session.get(Project, project_id) or abort(404)
     if not project.user_id == user.id:
         abort(401)
-    return project.products
+    return db.select(Product).where(Product.project_id == project.id)
 
 
 @products.route('/products', methods=['POST'])
@@ -39,13 +44,28 @@ def new_product(args, project_id):
         abort(401)
     product = Product(project=project, **args)
     db.session.add(product)
+    project.apply_cost_delta(products=product.calc_total_cost(project.total_months()))
     db.session.commit()
-    project.update_budget()
     return product
 
 
+@products.route('/products/bulk', methods=['POST'])
+@authenticate(token_auth)
+@response(bulk_created_schema, 201)
+@other_responses({400: 'Invalid rows', 404: 'Project not found', 401: 'User not allowed'})
+def new_products_bulk(project_id):
+    """Create many Products from a JSON array or a CSV file"""
+    user = token_auth.current_user()
+    project = db.session.get(Project, project_id) or abort(404)
+    if not project.user_id == user.id:
+        abort(401)
+    rows = load_rows(products_schema, unique='name_product')
+    return {'created': bulk_insert(Product, project, rows)}
+
+
 @products.route('/products/<int:product_id>', methods=['GET'])
 @authenticate(token_auth)
+@project_etag
 @response(product_schema)
 @other_responses({404: 'Project or Product not found', 401: 'User not allowed'})
 def get_product(project_id, product_id):
@@ -54,7 +74,7 @@ def get_product(project_id, product_id):
     project = db.session.get(Project, project_id) or abort(404)
     if not project.user_id == user.id:
         abort(401)
-    return db.session.get(Product, product_id) or abort(404)
+    return db.session.get(Product, product_id, options=eager_load(product_schema)) or abort(404)
 
 
 @products.route('/products/<int:product_id>', methods=['PUT'])
@@ -69,10 +89,11 @@ def update_product(data, project_id, product_id):
     if not project.user_id == user.id:
         abort(401)
     product = db.session.get(Product, product_id) or abort(404)
+    old_cost = product.calc_total_cost(project.total_months())
     product.update(data)
     db.session.add(product)
+    project.apply_cost_delta(products=product.calc_total_cost(project.total_months()) - old_cost)
     db.session.commit()
-    project.update_budget()
     return product
 
 
@@ -87,7 +108,8 @@ def delete_product(project_id, product_id):
     if not project.user_id == user.id:
         abort(401)
     product = db.session.get(Product, product_id) or abort(404)
+    old_cost = product.calc_total_cost(project.total_months())
     db.session.delete(product)
+    project.apply_cost_delta(products=-old_cost)
     db.session.commit()
-    project.update_budget()
     return {}
@@ -3,8 +3,10 @@ from apifairy import authenticate, response, body, other_responses
 
 from src.extensions import db
 from src.auth import token_auth
-from src.models import Project,  Member, Product
+from src.models import Project, ProjectCostSummary
 from src.schemas import ProjectSchema, CostProductLicenseSchema, CostProductTypeSchema, CostMembersSchema, EmptySchema
+from src.decorators import paginated_response, project_etag
+from src.loading import eager_load
 from .products import products
 from .members import members
 from .tasks import tasks
@@ -25,11 +27,11 @@ cost_members = CostMembersSchema()
 
 @projects.route('/projects', methods=['GET'])
 @authenticate(token_auth)
-@response(projects_schema)
+@paginated_response(projects_schema)
 def get_projects():
     """Return all user Projects"""
     user = token_auth.current_user()
-    return Project.query.where(Project.user_id == user.id).all()
+    return db.select(Project).where(Project.user_id == user.id)
 
 
 @projects.route('/projects', methods=['POST'])
@@ -47,12 +49,13 @@ def new_project(args):
 
 @projects.route('/projects/<int:project_id>', methods=['GET'])
 @authenticate(token_auth)
+@project_etag
 @response(project_schema)
 @other_responses({404: 'Project not found', 401: 'User not allow to view this project'})
 def get_project(project_id):
     """Return a Project by id"""
     user = token_auth.current_user()
-    project = db.session.get(Project, project_id) or abort(404)
+    project = db.session.get(Project, project_id, options=eager_load(project_schema)) or abort(404)
     if project.user_id == user.id:
         return project
     abort(401)
@@ -70,8 +73,8 @@ def update_project(data, project_id):
     if not project.user_id == user.id:
         abort(401)
     project.update(data)
-    db.session.commit()
     project.update_budget()
+    db.session.commit()
     return project
 
 
@@ -92,6 +95,7 @@ def delete_project(project_id):
 
 @projects.route('projects/<int:project_id>/members_costs', methods=['GET'])
 @authenticate(token_auth)
+@project_etag
 @response(cost_members)
 @other_responses({404: 'Project not found', 401: 'User not allowed'})
 def get_cost_of_all_members(project_id):
@@ -100,11 +104,12 @@ def get_cost_of_all_members(project_id):
     project = db.session.get(Project, project_id) or abort(404)
     if not project.user_id == user.id:
         abort(401)
-    return {'Members': Member.calc_costs_for_all_members(project_id)}
+    return {'Members': ProjectCostSummary.for_project(project_id).members}
 
 
 @projects.route('projects/<int:project_id>/products_by_license', methods=['GET'])
 @authenticate(token_auth)
+@project_etag
 @response(cost_products_by_license)
 @other_responses({404: 'Project not found', 401: 'User not allowed'})
 def get_cost_of_all_products_by_license(project_id):
@@ -113,11 +118,12 @@ def get_cost_of_all_products_by_license(project_id):
     project = db.session.get(Project, project_id) or abort(404)
     if not project.user_id == user.id:
         abort(401)
-    return Product.calc_total_costs_by_license(project_id)
+    return ProjectCostSummary.for_project(project_id).costs_by_license()
 
 
 @projects.route('projects/<int:project_id>/products_by_type', methods=['GET'])
 @authenticate(token_auth)
+@project_etag
 @response(cost_products_by_type)
 @other_responses({404: 'Project not found', 401: 'User not allowed'})
 def get_cost_of_all_products_by_type(project_id):
@@ -126,4 +132,4 @@ def get_cost_of_all_products_by_type(project_id):
     project = db.session.get(Project, project_id) or abort(404)
     if not project.user_id == user.id:
         abort(401)
-    return Product.calc_total_costs_by_type(project_id)
+    return ProjectCostSummary.for_project(project_id).costs_by_type
@@ -3,8 +3,11 @@ from apifairy import authenticate, response, body, other_responses
 
 from src.extensions import db
 from src.auth import token_auth
-from src.models import Member, Task, Project
-from src.schemas import TaskSchema, EmptySchema
+from src.models import Member, Task, Project, ProjectCostSummary, task_member
+from src.schemas import TaskSchema, EmptySchema, BulkCreatedSchema, AssignmentsSchema, AssignmentsResultSchema
+from src.bulk import load_rows, bulk_insert
+from src.decorators import paginated_response, project_etag
+from src.loading import eager_load
 
 
 tasks = Blueprint('tasks', __name__)
@@ -12,11 +15,15 @@ tasks = Blueprint('tasks', __name__)
 task_schema = TaskSchema()
 tasks_schema = TaskSchema(many=True)
 update_task_schema = TaskSchema(partial=True)
+bulk_created_schema = BulkCreatedSchema()
+assignments_schema = AssignmentsSchema()
+assignments_result_schema = AssignmentsResultSchema()
 
 
 @tasks.route('/tasks', methods=['GET'])
 @authenticate(token_auth)
-@response(tasks_schema)
+@project_etag
+@paginated_response(tasks_schema)
 @other_responses({404: 'Project not found', 401: 'User not allowed'})
 def get_tasks(project_id):
     """Return all Tasks"""
@@ -24,7 +31,7 @@ def get_tasks(project_id):
     project = db.session.get(Project, project_id) or abort(404)
     if not project.user_id == user.id:
         abort(401)
-    return project.tasks
+    return db.select(Task).where(Task.project_id == project.id)
 
 
 @tasks.route('/tasks', methods=['POST'])
@@ -44,8 +51,23 @@ def new_task(args, project_id):
     return task
 
 
+@tasks.route('/tasks/bulk', methods=['POST'])
+@authenticate(token_auth)
+@response(bulk_created_schema, 201)
+@other_responses({400: 'Invalid rows', 404: 'Project not found', 401: 'User not allowed'})
+def new_tasks_bulk(project_id):
+    """Create many Tasks from a JSON array or a CSV file"""
+    user = token_auth.current_user()
+    project = db.session.get(Project, project_id) or abort(404)
+    if not project.user_id == user.id:
+        abort(401)
+    rows = load_rows(tasks_schema, unique='name_task')
+    return {'created': bulk_insert(Task, project, rows)}
+
+
 @tasks.route('/tasks/<int:task_id>', methods=['GET'])
 @authenticate(token_auth)
+@project_etag
 @response(task_schema)
 @other_responses({404: 'Project or Task not found', 401: 'User not allowed'})
 def get_task(project_id, task_id):
@@ -54,7 +76,7 @@ def get_task(project_id, task_id):
     project = db.session.get(Project, project_id) or abort(404)
     if not project.user_id == user.id:
         abort(401)
-    return db.session.get(Task, task_id) or abort(404)
+    return db.session.get(Task, task_id, options=eager_load(task_schema)) or abort(404)
 
 
 @tasks.route('/tasks/<int:task_id>', methods=['PUT'])
@@ -69,10 +91,11 @@ def update_task(data, project_id, task_id):
     if not project.user_id == user.id:
         abort(401)
     task = db.session.get(Task, task_id) or abort(404)
+    old_cost = sum(member.calc_total_cost() for member in task.members)
     task.update(data)
     db.session.add(task)
+    project.apply_cost_delta(members=sum(member.calc_total_cost() for member in task.members) - old_cost)
     db.session.commit()
-    project.update_budget()
     return task
 
 
@@ -87,7 +110,10 @@ def delete_task(project_id, task_id):
     if not project.user_id == user.id:
         abort(401)
     task = db.session.get(Task, task_id) or abort(404)
+    members = list(task.members)
+    old_cost = sum(member.calc_total_cost() for member in members)
     db.session.delete(task)
+    project.apply_cost_delta(members=sum(member.calc_total_cost() for member in members) - old_cost)
     db.session.commit()
     return {}
 
@@ -107,7 +133,46 @@ def assign_member(project_id, task_id, member_id):
     member = db.session.get(Member, member_id) or abort(404)
     if task.has_member(member):
         abort(409)
+    old_cost = member.calc_total_cost()
     task.assign_member(member)
+    project.apply_cost_delta(members=member.calc_total_cost() - old_cost)
     db.session.commit()
-    project.update_budget()
     return task
+
+
+@tasks.route('/tasks/assignments', methods=['PUT'])
+@authenticate(token_auth)
+@body(assignments_schema)
+@response(assignments_result_schema)
+@other_responses({404: 'Project or Task or Member not found', 401: 'User not allowed'})
+def assign_members(args, project_id):
+    """Assign many Members to Tasks"""
+    user = token_auth.current_user()
+    project = db.session.get(Project, project_id) or abort(404)
+    if not project.user_id == user.id:
+        abort(401)
+    pairs = {(assignment['task_id'], assignment['member_id']) for assignment in args['assignments']}
+    task_ids = {task_id for task_id, _ in pairs}
+    member_ids = {member_id for _, member_id in pairs}
+    found_tasks = db.session.scalar(db.select(db.func.count(Task.id))
+                                    .where(Task.id.in_(task_ids), Task.project_id == project.id))
+    found_members = db.session.scalar(db.select(db.func.count(Member.id))
+                                      .where(Member.id.in_(member_ids), Member.project_id == project.id))
+    if found_tasks != len(task_ids) or found_members != len(member_ids):
+        abort(404)
+
+    existing = set(db.session.execute(
+        db.select(task_member.c.task_id, task_member.c.member_id)
+        .where(task_member.c.task_id.in_(task_ids), task_member.c.member_id.in_(member_ids))
+    ).tuples())
+    new_pairs = sorted(pairs - existing)
+    if new_pairs:
+        affected = {member_id for _, member_id in new_pairs}
+        old_cost = Member.sum_total_costs(Member.id.in_(affected))
+        db.session.execute(task_member.insert(), [
+            {'task_id': task_id, 'member_id': member_id} for task_id, member_id in new_pairs
+        ])
+        ProjectCostSummary.mark_changed(project.id, members=True)
+        project.apply_cost_delta(members=Member.sum_total_costs(Member.id.in_(affected)) - old_cost)
+        db.session.commit()
+    return {'assigned': len(new_pairs), 'skipped': len(pairs) - len(new_pairs)}
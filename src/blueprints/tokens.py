@@ -39,7 +39,6 @@ def new_tokens():
     user = basic_auth.current_user()
     token = user.generate_auth_token()
     db.session.add(token)
-    token.clean()
     db.session.commit()
     return token_response(token)
 
@@ -75,7 +74,6 @@ def revoke_token():
     if not token:
         abort(401)
     token.expire()
-    token.clean()
     db.session.commit()
     return {}
 
@@ -5,6 +5,8 @@ from src.extensions import db
 from src.auth import token_auth
 from src.models import User
 from src.schemas import AllUsersSchema, UserSchema, EmptySchema
+from src.decorators import paginated_response
+from src.loading import eager_load
 
 users = Blueprint('users', __name__)
 
@@ -14,10 +16,10 @@ update_user_schema = UserSchema(partial=True)
 
 
 @users.route('/users', methods=['GET'])
-@response(users_schema)
+@paginated_response(users_schema)
 def get_users():
     """Shows all Users"""
-    return User.query.all()
+    return db.select(User)
 
 
 @users.route('/users', methods=['POST'])
@@ -37,7 +39,7 @@ def new_user(args):
 @other_responses({404: 'User not found'})
 def get_user(user_id):
     """Return a User by id"""
-    return db.session.get(User, user_id) or abort(404)
+    return db.session.get(User, user_id, options=eager_load(user_schema)) or abort(404)
 
 
 @users.route('/users/me', methods=['GET'])
@@ -0,0 +1,76 @@
+import csv
+import io
+
+from apifairy.exceptions import ValidationError
+from flask import current_app, request
+from marshmallow import ValidationError as SchemaValidationError
+
+from .extensions import db
+from .models import Member, Product, ProjectCostSummary
+
+
+def load_rows(schema, unique=None):
+    """Validate the rows of a bulk request with a ``many=True`` schema.
+
+    The rows are sent as a JSON array, a ``text/csv`` body or a CSV file
+    upload with a header line. Errors are reported per row index. When
+    unique names a column, values already taken in the table or repeated in
+    the request are reported as errors too.
+    """
+    if request.files:
+        location = 'files'
+        upload = next(iter(request.files.values()))
+        data = _read_csv(location, io.TextIOWrapper(upload.stream, encoding='utf-8-sig'))
+    elif request.mimetype == 'text/csv':
+        location = 'csv'
+        data = _read_csv(location, io.TextIOWrapper(io.BytesIO(request.get_data()), encoding='utf-8-sig'))
+    else:
+        location = 'json'
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            raise ValidationError(400, {location: ['Expected a JSON array or a CSV file.']})
+    if len(data) > current_app.config['BULK_MAX_ROWS']:
+        raise ValidationError(400, {location: [f'At most {current_app.config["BULK_MAX_ROWS"]} rows are allowed.']})
+
+    try:
+        rows = schema.load(data)
+    except SchemaValidationError as error:
+        raise ValidationError(400, {location: error.messages})
+
+    if unique is not None:
+        errors = _unique_errors(schema.opts.model, unique, rows)
+        if errors:
+            raise ValidationError(400, {location: errors})
+    return rows
+
+
+def bulk_insert(model, project, rows):
+    """Insert rows into a project in one statement and recompute its budget once."""
+    if rows:
+        db.session.execute(db.insert(model), [dict(row, project_id=project.id) for row in rows])
+        ProjectCostSummary.mark_changed(project.id, members=model is Member,
+                                        products=rows if model is Product else ())
+    project.update_budget()
+    db.session.commit()
+    return len(rows)
+
+
+def _read_csv(location, stream):
+    try:
+        # empty cells are treated as missing values
+        return [{key: value for key, value in row.items() if value != ''} for row in csv.DictReader(stream)]
+    except UnicodeDecodeError:
+        raise ValidationError(400, {location: ['The CSV file must be encoded in UTF-8.']})
+
+
+def _unique_errors(model, unique, rows):
+    column = getattr(model, unique)
+    values = [row[unique] for row in rows]
+    taken = set(db.session.scalars(db.select(column).where(column.in_(values))))
+    errors = {}
+    seen = set()
+    for index, value in enumerate(values):
+        if value in taken or value in seen:
+            errors[index] = {unique: ['Already exists.']}
+        seen.add(value)
+    return errors
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from threading import Lock
+
+from flask import current_app
+
+
+class TokenCache:
+    """In-process LRU cache of verified access tokens.
+
+    Maps an opaque access token to the id of its user until the token expires
+    or the cache TTL runs out, whichever comes first. The TTL is bounded by
+    ``ACCESS_TOKEN_MINUTES``. Each app gets its own `TokenCacheState` in
+    ``app.extensions['token_cache']``.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        access_token_seconds = app.config['ACCESS_TOKEN_MINUTES'] * 60
+        ttl = min(app.config.get('TOKEN_CACHE_SECONDS') or access_token_seconds, access_token_seconds)
+        app.extensions['token_cache'] = TokenCacheState(app.config.get('TOKEN_CACHE_SIZE', 0),
+                                                        timedelta(seconds=ttl))
+
+    @staticmethod
+    def state():
+        return current_app.extensions['token_cache']
+
+    def __len__(self):
+        return len(self.state())
+
+    def get(self, access_token):
+        """Return the user id of a cached access token, or None."""
+        return self.state().get(access_token)
+
+    def set(self, access_token, user_id, access_expiration):
+        self.state().set(access_token, user_id, access_expiration)
+
+    def invalidate(self, access_token):
+        self.state().invalidate(access_token)
+
+    def invalidate_user(self, user_id):
+        self.state().invalidate_user(user_id)
+
+    def clear(self):
+        self.state().clear()
+
+    def stats(self):
+        return self.state().stats()
+
+
+class TokenCacheState:
+    """The cached tokens and counters of one app."""
+
+    def __init__(self, maxsize=0, ttl=timedelta(0)):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, access_token):
+        with self._lock:
+            entry = self._entries.get(access_token)
+            if entry is not None:
+                user_id, expiration = entry
+                if expiration > datetime.now():
+                    self._entries.move_to_end(access_token)
+                    self.hits += 1
+                    return user_id
+                del self._entries[access_token]
+            self.misses += 1
+
+    def set(self, access_token, user_id, access_expiration):
+        if self.maxsize <= 0:
+            return
+        expiration = min(access_expiration, datetime.now() + self.ttl)
+        with self._lock:
+            self._entries[access_token] = (user_id, expiration)
+            self._entries.move_to_end(access_token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, access_token):
+        with self._lock:
+            self._entries.pop(access_token, None)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for access_token in [token for token, entry in self._entries.items() if entry[0] == user_id]:
+                del self._entries[access_token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
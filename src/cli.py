@@ -0,0 +1,71 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from .extensions import db
+from .models import Project, ProjectCostSummary, Token
+
+budget = AppGroup('budget', help='Project budget maintenance commands.')
+
+
+@budget.command('check')
+@click.option('--fix', is_flag=True, help='Recompute the budget of the projects that are out of date.')
+def check_budget(fix):
+    """Compare the stored budgets against a full recomputation."""
+    stale = 0
+    for project in db.session.scalars(db.select(Project).order_by(Project.id)):
+        differences = project.check_budget()
+        if not differences:
+            continue
+        stale += 1
+        for name, (stored, expected) in differences.items():
+            click.echo(f'Project {project.id}: {name} is {stored}, expected {expected}')
+        if fix:
+            project.update_budget()
+    if fix:
+        db.session.commit()
+    if stale and not fix:
+        raise click.ClickException(f'{stale} project(s) with an out of date budget')
+    click.echo(f'{stale} project(s) with an out of date budget')
+
+
+@budget.command('recompute')
+@click.option('--project-id', type=int, help='Only recompute this project.')
+def recompute_budget(project_id):
+    """Recompute the budget of every project from scratch."""
+    query = db.select(Project).order_by(Project.id)
+    if project_id is not None:
+        query = query.where(Project.id == project_id)
+    projects = db.session.scalars(query).all()
+    for project in projects:
+        project.update_budget()
+    db.session.commit()
+    click.echo(f'{len(projects)} project(s) recomputed')
+
+
+summary = AppGroup('summary', help='Project cost summary maintenance commands.')
+
+
+@summary.command('rebuild')
+@click.option('--project-id', type=int, help='Only rebuild the summary of this project.')
+def rebuild_summary(project_id):
+    """Rebuild the stored cost summaries from the project rows."""
+    query = db.select(Project.id).order_by(Project.id)
+    if project_id is not None:
+        query = query.where(Project.id == project_id)
+    project_ids = db.session.scalars(query).all()
+    for project_id in project_ids:
+        ProjectCostSummary.rebuild(project_id)
+    db.session.commit()
+    click.echo(f'{len(project_ids)} project(s) rebuilt')
+
+
+tokens = AppGroup('tokens', help='Token maintenance commands.')
+
+
+@tokens.command('reap')
+@click.option('--batch-size', type=int, help='Number of tokens deleted per transaction.')
+def reap_tokens(batch_size):
+    """Delete the tokens that expired more than a day ago."""
+    deleted = Token.clean(batch_size or current_app.config['TOKEN_REAPER_BATCH_SIZE'])
+    click.echo(f'{deleted} expired token(s) deleted')
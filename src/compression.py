@@ -0,0 +1,175 @@
+import gzip
+import zlib
+from collections import OrderedDict
+from threading import Lock
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/html', 'text/plain', 'text/css',
+                          'application/javascript'}
+
+
+def _gzip_compressor():
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return (compressor.compress,
+            lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+            compressor.flush)
+
+
+def _brotli_compressor():
+    compressor = brotli.Compressor(quality=4)
+    return compressor.process, compressor.flush, compressor.finish
+
+
+def _zstd_compressor():
+    compressor = zstandard.ZstdCompressor(level=3).compressobj()
+    return (compressor.compress,
+            lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            compressor.flush)
+
+
+# in order of preference, the best ratio for JSON first
+ENCODINGS = {}
+if brotli is not None:
+    ENCODINGS['br'] = (lambda data: brotli.compress(data, quality=4), _brotli_compressor)
+if zstandard is not None:
+    ENCODINGS['zstd'] = (lambda data: zstandard.ZstdCompressor(level=3).compress(data), _zstd_compressor)
+ENCODINGS['gzip'] = (lambda data: gzip.compress(data, compresslevel=6, mtime=0), _gzip_compressor)
+
+
+class Compression:
+    """Compress responses with the best encoding the client accepts.
+
+    Brotli and Zstandard are used when their packages are installed, gzip
+    otherwise. Bodies smaller than ``COMPRESS_MIN_SIZE`` bytes are sent as
+    they are. Streamed responses are compressed chunk by chunk, flushing
+    after each one so that the client receives them as they are produced,
+    unless ``COMPRESS_STREAMS`` is disabled.
+
+    The compressed bodies of the last ``COMPRESS_CACHE_SIZE`` responses that
+    have an ETag are kept, so polling a resource that did not change does
+    not compress it again. The encoding is appended to the ETag of a
+    compressed response (``"<tag>-gzip"``), so that each representation has
+    its own strong ETag; `etag_without_encoding` removes it. Each app gets
+    its own `CompressionState` in ``app.extensions['compression']``.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if 'compression' not in app.extensions:
+            app.after_request(self._compress_response)
+        app.extensions['compression'] = CompressionState(app.config['COMPRESS_MIN_SIZE'],
+                                                         app.config['COMPRESS_STREAMS'],
+                                                         app.config['COMPRESS_CACHE_SIZE'])
+
+    @staticmethod
+    def state():
+        return current_app.extensions['compression']
+
+    def clear(self):
+        self.state().clear()
+
+    def _compress_response(self, response):
+        if response.status_code == 304:
+            # stands for a response that was compressed by encoding
+            if response.headers.get('ETag'):
+                response.vary.add('Accept-Encoding')
+            return response
+        if (response.status_code < 200 or response.status_code == 204 or response.direct_passthrough
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        encoding = self._negotiate()
+        if encoding is None:
+            return response
+        state = self.state()
+        if response.is_streamed:
+            if not state.streams:
+                return response
+            response.response = _compress_stream(response.response, ENCODINGS[encoding][1])
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < state.min_size:
+                return response
+            response.set_data(state.compress(data, encoding, response.headers.get('ETag')))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f'{etag}-{encoding}', weak=weak)
+        return response
+
+    @staticmethod
+    def _negotiate():
+        quality = {encoding: request.accept_encodings[encoding] for encoding in ENCODINGS}
+        # ties go to the first encoding in the order of preference
+        encoding = max(ENCODINGS, key=quality.get)
+        return encoding if quality[encoding] > 0 else None
+
+
+class CompressionState:
+    """The settings and cached compressed bodies of one app."""
+
+    def __init__(self, min_size=0, streams=True, maxsize=0):
+        self.min_size = min_size
+        self.streams = streams
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def compress(self, data, encoding, etag):
+        if not etag or self.maxsize <= 0:
+            return ENCODINGS[encoding][0](data)
+        # ETags are only unique within a resource
+        key = (request.full_path, etag, encoding)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                return compressed
+        compressed = ENCODINGS[encoding][0](data)
+        with self._lock:
+            self._entries[key] = compressed
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compressed
+
+
+def _compress_stream(chunks, compressor_factory):
+    compress, flush, finish = compressor_factory()
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield compress(chunk) + flush()
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def etag_without_encoding(etag):
+    """Return the ETag of the uncompressed representation of a compressed response."""
+    for encoding in ENCODINGS:
+        if etag.endswith(f'-{encoding}'):
+            return etag[:-len(encoding) - 1]
+    return etag
@@ -0,0 +1,147 @@
+import hashlib
+from datetime import date
+from functools import wraps
+
+from apifairy import arguments, response
+from flask import Response, current_app, make_response, request, stream_with_context, url_for
+
+from .auth import token_auth
+from .compression import etag_without_encoding
+from .extensions import db
+from .loading import eager_load
+from .models import Project
+from .schemas import PaginationSchema, PaginationHeadersSchema
+
+NDJSON = 'application/x-ndjson'
+
+
+def paginated_response(schema, status_code=200, description=None):
+    """Return a page of the select query built by the view function.
+
+    Pages are keyed on the id of the selected model: ``limit`` sets the page
+    size (capped at ``PAGE_SIZE_MAX``) and ``after`` the last id seen. When
+    there are more rows, a ``Link`` header points to the next page.
+
+    With ``stream=1``, or when the client accepts ``application/x-ndjson``,
+    the whole collection after ``after`` is streamed instead, see
+    `stream_response`.
+    """
+    def inner(f):
+        @wraps(f)
+        def paginate(*args, **kwargs):
+            args = list(args)
+            pagination = args.pop(-1)
+            select_query = f(*args, **kwargs).options(*eager_load(schema))
+            key = select_query.column_descriptions[0]['entity'].id
+
+            limit = min(pagination.get('limit', current_app.config['PAGE_SIZE_DEFAULT']),
+                        current_app.config['PAGE_SIZE_MAX'])
+            after = pagination.get('after')
+            if after is not None:
+                select_query = select_query.where(key > after)
+            items = db.session.scalars(select_query.order_by(key).limit(limit + 1)).all()
+
+            headers = {}
+            if len(items) > limit:
+                items = items[:limit]
+                next_url = url_for(request.endpoint, **request.view_args, limit=limit, after=items[-1].id)
+                headers['Link'] = f'<{next_url}>; rel="next"'
+            return items, status_code, headers
+
+        paginate = response(schema, status_code=status_code, description=description,
+                            headers=PaginationHeadersSchema)(paginate)
+
+        @wraps(paginate)
+        def paginate_or_stream(*args, **kwargs):
+            pagination = args[-1]
+            ndjson = request.accept_mimetypes.best_match(['application/json', NDJSON]) == NDJSON
+            if not pagination.get('stream') and not ndjson:
+                return paginate(*args, **kwargs)
+
+            select_query = f(*args[:-1], **kwargs).options(*eager_load(schema))
+            key = select_query.column_descriptions[0]['entity'].id
+            if pagination.get('after') is not None:
+                select_query = select_query.where(key > pagination['after'])
+            if pagination.get('limit') is not None:
+                select_query = select_query.limit(pagination['limit'])
+            return stream_response(schema, select_query.order_by(key), status_code, ndjson)
+
+        return arguments(PaginationSchema)(paginate_or_stream)
+    return inner
+
+
+def project_etag(f):
+    """Answer conditional GETs of a project resource from the project version.
+
+    Goes between ``@authenticate`` and ``@response``. The ETag is built from
+    the version of the project, which every commit that writes the project
+    or its rows increments, from the current day, since the costs depend on
+    it, and from the query string, so that each page of a collection and
+    each set of arguments, valid or not, has its own tag. When
+    ``If-None-Match`` matches, ignoring the encoding suffix of
+    compressed responses, a 304 is returned before the view function loads
+    anything. Missing projects and projects of other users are left to the
+    view function.
+    """
+    @wraps(f)
+    def conditional(*args, **kwargs):
+        project_id = kwargs['project_id']
+        row = db.session.execute(db.select(Project.user_id, Project.version)
+                                 .where(Project.id == project_id)).first()
+        if row is None or row.user_id != token_auth.current_user().id:
+            return f(*args, **kwargs)
+
+        etag = f'{project_id}-{row.version}-{date.today():%Y%m%d}'
+        if request.query_string:
+            etag += '-' + hashlib.sha1(request.query_string).hexdigest()[:16]
+        if request.accept_mimetypes.best_match(['application/json', NDJSON]) == NDJSON:
+            etag += '-ndjson'
+        matched = _matching_etag(etag)
+        if matched is not None:
+            # the tag the client holds, suffixed if it was compressed
+            rv = Response(status=304)
+            rv.set_etag(matched)
+        else:
+            rv = make_response(f(*args, **kwargs))
+            if rv.status_code != 200:
+                return rv
+            rv.set_etag(etag)
+        rv.headers['Cache-Control'] = 'private, no-cache'
+        return rv
+    return conditional
+
+
+def _matching_etag(etag):
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return etag
+    for tag in if_none_match.as_set(include_weak=True):
+        if etag_without_encoding(tag) == etag:
+            return tag
+
+
+def stream_response(schema, select_query, status_code=200, ndjson=False):
+    """Stream the rows of a select query serialized one by one with schema.
+
+    Rows are fetched ``STREAM_CHUNK_SIZE`` at a time and written to the WSGI
+    server as soon as each chunk is serialized, so memory use does not grow
+    with the size of the collection. The body is a JSON array, or one JSON
+    document per line when ``ndjson`` is set.
+    """
+    chunk_size = current_app.config['STREAM_CHUNK_SIZE']
+
+    def generate():
+        rows = db.session.scalars(select_query.execution_options(yield_per=chunk_size))
+        if not ndjson:
+            yield '['
+        separator = ''
+        for partition in rows.partitions():
+            chunk = []
+            for row in partition:
+                chunk.append(separator + current_app.json.dumps(schema.dump(row, many=False)))
+                separator = '\n' if ndjson else ','
+            yield ''.join(chunk)
+        yield '\n' if ndjson else ']'
+
+    return Response(stream_with_context(generate()), status=status_code,
+                    mimetype=NDJSON if ndjson else 'application/json')
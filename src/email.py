@@ -1,4 +1,4 @@
-from src.extensions import mail
+from src.extensions import mail_queue
 from flask_mail import Message
 
 
@@ -13,4 +13,4 @@ def send_email(email, username, reset_url):
     
     Se você não solicitou a recuperação de senha, por favor, ignore este e-mail.
     """
-    mail.send(msg)
+    mail_queue.enqueue(msg)
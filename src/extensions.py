@@ -4,8 +4,27 @@ from flask_mail import Mail
 from flask_marshmallow import Marshmallow
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+from .cache import TokenCache
+from .compression import Compression
+from .hashing import PasswordHasher
+from .instrumentation import Instrumentation
+from .mailqueue import MailQueue
+from .metrics import Metrics
+from .migrate import LazyMigrate
+from .reaper import TokenReaper
+from .replicas import Replicas, RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+replicas = Replicas()
+migrate = LazyMigrate()
 ma = Marshmallow()
 af = APIFairy()
 mail = Mail()
+mail_queue = MailQueue()
 cors = CORS()
+token_cache = TokenCache()
+password_hasher = PasswordHasher()
+token_reaper = TokenReaper()
+instrumentation = Instrumentation()
+metrics = Metrics()
+compression = Compression()
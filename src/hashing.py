@@ -0,0 +1,88 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class PasswordHasher:
+    """Hash and check passwords in a pool of worker processes.
+
+    Password hashes are deliberately slow and hold the GIL, so running them
+    on the request threads stalls every other request. ``PASSWORD_HASH_WORKERS``
+    sets the size of the process pool (0 hashes on the calling thread) and
+    ``PASSWORD_HASH_METHOD`` the werkzeug hash method, e.g. ``scrypt:32768:8:1``
+    or ``pbkdf2:sha256:600000``. Each app gets its own `PasswordHasherState`
+    in ``app.extensions['password_hasher']``.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        previous = app.extensions.get('password_hasher')
+        if previous is not None:
+            previous.close()
+        app.extensions['password_hasher'] = PasswordHasherState(app.config['PASSWORD_HASH_METHOD'],
+                                                                app.config['PASSWORD_HASH_WORKERS'])
+
+    @staticmethod
+    def state():
+        return current_app.extensions['password_hasher']
+
+    def close(self):
+        self.state().close()
+
+    def hash(self, password):
+        return self.state().hash(password)
+
+    def verify(self, password_hash, password):
+        return self.state().verify(password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Whether a hash was made with a different method than the configured one."""
+        return self.state().needs_rehash(password_hash)
+
+
+class PasswordHasherState:
+    """The hash method and process pool of one app."""
+
+    def __init__(self, method='scrypt', workers=0):
+        self.method = method
+        self.workers = workers
+        self._prefix = None
+        self._executor = None
+        self._lock = Lock()
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        if self._prefix is None:
+            # werkzeug fills in the default parameters, so hash once to find them
+            self._prefix = generate_password_hash('', self.method).split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != self._prefix
+
+    def _run(self, function, *args):
+        if self.workers <= 0:
+            return function(*args)
+        return self._pool().submit(function, *args).result()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn rather than fork, the server process runs other threads
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
@@ -0,0 +1,90 @@
+import logging
+from time import perf_counter
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class TooManyStatements(AssertionError):
+    pass
+
+
+class Instrumentation:
+    """Count the SQL statements issued while handling each request and time them.
+
+    Every request is logged with its duration, number of SQL statements and
+    time spent in the database as ``extra`` fields of the log record. With
+    ``SERVER_TIMING`` enabled the same numbers are returned in a
+    ``Server-Timing`` header. Requests that issue more than
+    ``SQL_WARN_STATEMENTS`` statements or take longer than ``SLOW_REQUEST_MS``
+    are logged as warnings.
+
+    When ``SQL_MAX_STATEMENTS`` is set (usually only in tests), a request
+    that issues more statements fails with `TooManyStatements`.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    @staticmethod
+    def _start_request():
+        g.request_start = perf_counter()
+        g.sql_statements = 0
+        g.sql_time = 0.0
+
+    @staticmethod
+    def _finish_request(response):
+        config = current_app.config
+        statements = g.get('sql_statements', 0)
+        max_statements = config.get('SQL_MAX_STATEMENTS')
+        if max_statements and statements > max_statements:
+            raise TooManyStatements(f'{request.method} {request.path} issued {statements} SQL statements, '
+                                    f'more than the limit of {max_statements}')
+        if 'request_start' not in g:
+            return response
+
+        duration_ms = (perf_counter() - g.request_start) * 1000
+        sql_ms = g.sql_time * 1000
+        if config.get('SERVER_TIMING'):
+            response.headers.add('Server-Timing', f'db;dur={sql_ms:.1f};desc="{statements} statements"')
+            response.headers.add('Server-Timing', f'app;dur={duration_ms:.1f}')
+
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 1),
+            'sql_statements': statements,
+            'sql_ms': round(sql_ms, 1),
+        }
+        message = ' '.join(f'{key}={value}' for key, value in fields.items())
+        warn_statements = config.get('SQL_WARN_STATEMENTS')
+        slow_request_ms = config.get('SLOW_REQUEST_MS')
+        if (warn_statements and statements > warn_statements) or (slow_request_ms and duration_ms > slow_request_ms):
+            logger.warning('slow request %s', message, extra=fields)
+        else:
+            logger.info('request %s', message, extra=fields)
+        return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context() and 'sql_statements' in g:
+        g.sql_statements += 1
+        conn.info.setdefault('query_start', []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context() and 'sql_time' in g and conn.info.get('query_start'):
+        g.sql_time += perf_counter() - conn.info['query_start'].pop()
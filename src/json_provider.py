@@ -0,0 +1,68 @@
+import datetime
+import decimal
+import enum
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize JSON with orjson, falling back to the stdlib encoder.
+
+    Dates and datetimes are serialized as ISO 8601 strings and enums by
+    value, which orjson does natively. Decimals are serialized as strings,
+    like the default provider does. Calls with arguments for `json.dumps`,
+    and values orjson cannot encode (integers over 64 bits), go through the
+    stdlib encoder with the same conversions. Non-ASCII characters are
+    written as UTF-8 rather than escaped.
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, decimal.Decimal):
+            return str(o)
+        if isinstance(o, (datetime.date, datetime.time)):
+            return o.isoformat()
+        if isinstance(o, enum.Enum):
+            return o.value
+        return DefaultJSONProvider.default(o)
+
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        options = self._options() | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            options |= orjson.OPT_INDENT_2
+        try:
+            data = orjson.dumps(obj, default=self.default, option=options)
+        except orjson.JSONEncodeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(data, mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {
+    'default': DefaultJSONProvider,
+    'orjson': OrjsonProvider if orjson is not None else DefaultJSONProvider,
+}
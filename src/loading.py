@@ -0,0 +1,33 @@
+from functools import lru_cache
+
+from marshmallow import fields
+from sqlalchemy.orm import joinedload, selectinload
+
+from .extensions import db
+
+
+@lru_cache(maxsize=None)
+def eager_load(schema, model=None, depth=3):
+    """Return the loader options needed to serialize model with schema.
+
+    Walks the nested fields that schema dumps (honoring ``only`` and
+    ``exclude``) and loads the matching relationships up front: collections
+    with ``selectinload`` and single objects with ``joinedload``. Nested
+    schemas are followed up to depth levels.
+    """
+    model = model or schema.opts.model
+    if model is None or depth <= 0:
+        return ()
+    relationships = db.inspect(model).relationships
+    options = []
+    for name, field in schema.dump_fields.items():
+        if not isinstance(field, fields.Nested):
+            continue
+        relationship = relationships.get(field.attribute or name)
+        if relationship is None:
+            continue
+        loader = selectinload if relationship.uselist else joinedload
+        option = loader(getattr(model, relationship.key))
+        nested_options = eager_load(field.schema, relationship.mapper.class_, depth - 1)
+        options.append(option.options(*nested_options) if nested_options else option)
+    return tuple(options)
@@ -0,0 +1,213 @@
+import logging
+import queue
+from threading import Condition, Lock, Thread, Timer
+from time import perf_counter
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class MailQueue:
+    """Deliver outgoing emails from a pool of background worker threads.
+
+    Each worker keeps its SMTP connection open while there are messages to
+    send, takes up to ``MAIL_QUEUE_BATCH_SIZE`` messages at a time and closes
+    the connection after ``MAIL_QUEUE_IDLE_SECONDS`` without work. Failed
+    messages are retried ``MAIL_QUEUE_RETRIES`` times, waiting
+    ``MAIL_QUEUE_BACKOFF`` seconds before the first retry and doubling the
+    wait on each one. With ``MAIL_QUEUE_WORKERS`` set to 0 messages are sent
+    on the calling thread. Each app gets its own `MailQueueState` in
+    ``app.extensions['mail_queue']``.
+    """
+
+    def __init__(self, app=None, mail=None):
+        self.on_send = []
+        if app is not None:
+            self.init_app(app, mail)
+
+    def init_app(self, app, mail):
+        previous = app.extensions.get('mail_queue')
+        if previous is not None:
+            previous.close()
+        app.extensions['mail_queue'] = MailQueueState(app, mail, self.on_send)
+
+    @staticmethod
+    def state():
+        return current_app.extensions['mail_queue']
+
+    def depth(self):
+        """Number of messages waiting to be sent, including pending retries."""
+        return self.state().depth()
+
+    def stats(self):
+        return self.state().stats()
+
+    def enqueue(self, message):
+        self.state().enqueue(message)
+
+    def join(self):
+        """Block until every queued message was sent or given up."""
+        self.state().join()
+
+
+class MailQueueState:
+    """The settings, counters and worker threads of the mail queue of one app."""
+
+    def __init__(self, app, mail, on_send=()):
+        self.app = app
+        self.mail = mail
+        self.on_send = on_send
+        self.workers = app.config['MAIL_QUEUE_WORKERS']
+        self.batch_size = app.config['MAIL_QUEUE_BATCH_SIZE']
+        self.retries = app.config['MAIL_QUEUE_RETRIES']
+        self.backoff = app.config['MAIL_QUEUE_BACKOFF']
+        self.idle_seconds = app.config['MAIL_QUEUE_IDLE_SECONDS']
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self._queue = queue.SimpleQueue()
+        # messages enqueued and not yet sent or given up, retries included
+        self._pending = 0
+        self._idle = Condition()
+        self._threads = []
+        self._lock = Lock()
+        self._closed = False
+
+    def depth(self):
+        return self._pending
+
+    def stats(self):
+        return {
+            'depth': self.depth(),
+            'workers': len(self._threads),
+            'sent': self.sent,
+            'failed': self.failed,
+            'retried': self.retried,
+        }
+
+    def enqueue(self, message):
+        if self.workers <= 0 or self._closed:
+            with self.mail.connect() as connection:
+                duration = self._send(connection, message)
+            self._sent(duration)
+            return
+        self._start_workers()
+        with self._idle:
+            self._pending += 1
+        self._queue.put((message, 0))
+
+    def join(self):
+        with self._idle:
+            self._idle.wait_for(lambda: self._pending == 0)
+
+    def close(self):
+        """Stop the workers once the queued messages were sent or given up."""
+        self._closed = True
+        self.join()
+        with self._lock:
+            for _ in self._threads:
+                self._queue.put(None)
+            self._threads = []
+
+    def _start_workers(self):
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = Thread(target=self._work, name=f'mail-queue-{len(self._threads)}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        batch = []
+        while batch is not None:
+            if not batch:
+                batch = self._next_batch(timeout=None)
+            if batch:
+                batch = self._send_batches(batch)
+
+    def _next_batch(self, timeout):
+        """Take up to ``batch_size`` messages, waiting at most timeout seconds for the first one.
+
+        Returns None when `close` stopped the workers.
+        """
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        if batch[0] is None:
+            return None
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _send_batches(self, batch):
+        """Send batch, and the batches that follow it, over one SMTP connection.
+
+        The connection is closed after ``idle_seconds`` without messages or
+        when a message fails. The messages left over are returned, or None
+        when the workers were stopped.
+        """
+        item = batch.pop(0)
+        with self.app.app_context():
+            try:
+                with self.mail.connect() as connection:
+                    while item is not None:
+                        duration = self._send(connection, item[0])
+                        item = None
+                        self._sent(duration)
+                        self._done()
+                        if not batch:
+                            batch = self._next_batch(timeout=self.idle_seconds)
+                        if batch:
+                            item = batch.pop(0)
+            except Exception:
+                if item is None:
+                    logger.warning('Closing the connection to the mail server failed', exc_info=True)
+                else:
+                    self._retry(*item)
+        return batch
+
+    @staticmethod
+    def _send(connection, message):
+        start = perf_counter()
+        connection.send(message)
+        return perf_counter() - start
+
+    def _sent(self, duration):
+        with self._lock:
+            self.sent += 1
+        for callback in self.on_send:
+            try:
+                callback(duration)
+            except Exception:
+                logger.exception('Mail queue callback %r failed', callback)
+
+    def _done(self):
+        with self._idle:
+            self._pending -= 1
+            if self._pending <= 0:
+                self._idle.notify_all()
+
+    def _retry(self, message, attempt):
+        if attempt >= self.retries:
+            with self._lock:
+                self.failed += 1
+            logger.exception('Giving up sending email to %s after %d attempts', message.recipients, attempt + 1)
+            self._done()
+            return
+        with self._lock:
+            self.retried += 1
+        delay = self.backoff * 2 ** attempt
+        logger.warning('Sending email to %s failed, retrying in %.1f seconds', message.recipients, delay)
+        item = (message, attempt + 1)
+        if delay <= 0:
+            self._queue.put(item)
+            return
+        # the retry stays pending while the timer is running
+        timer = Timer(delay, self._queue.put, args=(item,))
+        timer.daemon = True
+        timer.start()
@@ -0,0 +1,96 @@
+from time import perf_counter
+
+from flask import Response, current_app, g, request
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from .pool import pool_stats
+
+LATENCY_BUCKETS = (.005, .01, .025, .05, .075, .1, .25, .5, .75, 1, 2.5, 5, 10)
+
+
+class Metrics:
+    """Expose Prometheus metrics of the application at ``/metrics``.
+
+    Request latencies are recorded per endpoint, method and status. The
+    database pool, token cache and mail queue are read when the metrics are
+    scraped.
+    """
+
+    def __init__(self, app=None):
+        self.registry = CollectorRegistry()
+        self.request_duration = Histogram(
+            'http_request_duration_seconds', 'Time spent handling HTTP requests.',
+            ['method', 'endpoint', 'status'], buckets=LATENCY_BUCKETS, registry=self.registry)
+        self.email_send_duration = Histogram(
+            'email_send_duration_seconds', 'Time spent sending an email to the mail server.',
+            buckets=LATENCY_BUCKETS, registry=self.registry)
+        self.budget_update_duration = Histogram(
+            'budget_update_duration_seconds', 'Time spent updating the budget of a project.',
+            ['mode'], buckets=LATENCY_BUCKETS, registry=self.registry)
+        self.registry.register(_StateCollector())
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from .extensions import mail_queue
+
+        if self.email_send_duration.observe not in mail_queue.on_send:
+            mail_queue.on_send.append(self.email_send_duration.observe)
+        app.before_request(self._start_request)
+        app.after_request(self._observe_request)
+        app.add_url_rule('/metrics', 'metrics', self.view)
+
+    def view(self):
+        return Response(generate_latest(self.registry), content_type=CONTENT_TYPE_LATEST)
+
+    @staticmethod
+    def _start_request():
+        g.metrics_start = perf_counter()
+
+    def _observe_request(self, response):
+        if 'metrics_start' in g and request.endpoint != 'metrics':
+            self.request_duration.labels(
+                method=request.method,
+                endpoint=request.endpoint or 'none',
+                status=response.status_code,
+            ).observe(perf_counter() - g.metrics_start)
+        return response
+
+
+class _StateCollector:
+    """Read the current state of the database pool, token cache and mail queue."""
+
+    def collect(self):
+        from .extensions import db, mail_queue, token_cache
+
+        stats = pool_stats(db.engine, current_app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        if stats is not None:
+            yield GaugeMetricFamily('db_pool_size', 'Connections kept open by the database pool.',
+                                    value=stats['size'])
+            yield GaugeMetricFamily('db_pool_max_overflow', 'Connections the pool may open beyond its size.',
+                                    value=stats['max_overflow'])
+            yield GaugeMetricFamily('db_pool_checked_in', 'Idle database connections in the pool.',
+                                    value=stats['checked_in'])
+            yield GaugeMetricFamily('db_pool_checked_out', 'Database connections in use.',
+                                    value=stats['checked_out'])
+            yield GaugeMetricFamily('db_pool_overflow', 'Database connections open beyond the pool size.',
+                                    value=stats['overflow'])
+
+        stats = token_cache.stats()
+        yield GaugeMetricFamily('token_cache_size', 'Access tokens in the token cache.', value=stats['size'])
+        yield CounterMetricFamily('token_cache_hits', 'Access tokens found in the token cache.',
+                                  value=stats['hits'])
+        yield CounterMetricFamily('token_cache_misses', 'Access tokens not found in the token cache.',
+                                  value=stats['misses'])
+        lookups = stats['hits'] + stats['misses']
+        yield GaugeMetricFamily('token_cache_hit_ratio', 'Share of token cache lookups that were hits.',
+                                value=stats['hits'] / lookups if lookups else 0)
+
+        stats = mail_queue.stats()
+        yield GaugeMetricFamily('email_queue_depth', 'Emails waiting to be sent.', value=stats['depth'])
+        yield CounterMetricFamily('email_sent', 'Emails sent.', value=stats['sent'])
+        yield CounterMetricFamily('email_failed', 'Emails given up after every retry failed.',
+                                  value=stats['failed'])
+        yield CounterMetricFamily('email_retried', 'Email send attempts that were retried.',
+                                  value=stats['retried'])
@@ -0,0 +1,48 @@
+import click
+from flask.cli import ScriptInfo
+
+
+class LazyMigrate:
+    """Flask-Migrate, imported the first time a ``flask db`` command runs.
+
+    Flask-Migrate imports alembic, a large share of the import time of the
+    app that only the migration commands need. `init_app` registers a
+    ``db`` command group that initializes Flask-Migrate for the app when one
+    of its commands is looked up. Code that calls the Flask-Migrate
+    functions directly must call `load` first.
+    """
+
+    def __init__(self, app=None, db=None, **kwargs):
+        self.db = db
+        self.kwargs = kwargs
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db=None, **kwargs):
+        self.db = db or self.db
+        self.kwargs.update(kwargs)
+        app.cli.add_command(_MigrateGroup(self, name='db', help='Perform database migrations.'))
+
+    def load(self, app):
+        """Initialize Flask-Migrate for app and return its ``db`` command group."""
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as db_cli_group
+
+        if 'migrate' not in app.extensions:
+            Migrate(app, self.db, **self.kwargs)
+        return db_cli_group
+
+
+class _MigrateGroup(click.Group):
+    def __init__(self, migrate, **kwargs):
+        super().__init__(**kwargs)
+        self.migrate = migrate
+
+    def _group(self, ctx):
+        return self.migrate.load(ctx.ensure_object(ScriptInfo).load_app())
+
+    def list_commands(self, ctx):
+        return self._group(ctx).list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._group(ctx).get_command(ctx, name)
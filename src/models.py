@@ -1,3 +1,4 @@
+from collections import Counter
 from time import time
 from datetime import timedelta, date, datetime
 from dateutil import relativedelta
@@ -7,9 +8,11 @@ import secrets
 
 import jwt
 from flask import current_app, url_for
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event
+from sqlalchemy.orm.attributes import set_committed_value
 
-from .extensions import db
+from .extensions import db, token_cache, password_hasher, metrics, replicas
+from .sql import months_between
 
 
 class Updateable:
@@ -21,17 +24,25 @@ class Updateable:
 class Token(db.Model):
     __tablename__ = "token"
     id = db.Column(db.Integer, primary_key=True)
-    access_token = db.Column(db.String(64))
+    access_token = db.Column(db.String(64), index=True, unique=True)
     access_expiration = db.Column(db.DateTime)
-    refresh_token = db.Column(db.String(64))
-    refresh_expiration = db.Column(db.DateTime)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    refresh_token = db.Column(db.String(64), index=True, unique=True)
+    refresh_expiration = db.Column(db.DateTime, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
 
     user = db.relationship('User', backref='tokens')
 
     @property
     def access_token_jwt(self):
-        return jwt.encode({'token': self.access_token},
+        payload = {'token': self.access_token}
+        if current_app.config['ACCESS_TOKEN_STATELESS']:
+            # enough to authenticate the request without reading this table
+            payload.update({
+                'sub': str(self.user.id),
+                'exp': int(self.access_expiration.timestamp()),
+                'ver': self.user.token_version,
+            })
+        return jwt.encode(payload,
                           current_app.config['SECRET_KEY'],
                           algorithm='HS256')
 
@@ -44,24 +55,47 @@ class Token(db.Model):
     def expire(self, delay=0):
         self.access_expiration = datetime.now() + timedelta(seconds=delay)
         self.refresh_expiration = datetime.now() + timedelta(seconds=delay)
+        token_cache.invalidate(self.access_token)
 
     @staticmethod
-    def clean():
-        """Remove any tokens that have been expired for more than a day."""
+    def clean(batch_size=1000):
+        """Remove any tokens that have been expired for more than a day.
+
+        Tokens are deleted in batches of ``batch_size`` rows, committing after
+        each one so that no transaction holds locks on the table for long.
+        Returns the number of deleted tokens.
+        """
         yesterday = datetime.now() - timedelta(days=1)
-        db.session.query(Token).where(Token.refresh_expiration < yesterday).delete()
-        db.session.commit()
+        deleted = 0
+        while True:
+            ids = db.session.scalars(db.select(Token.id)
+                                     .where(Token.refresh_expiration < yesterday)
+                                     .limit(batch_size)).all()
+            if ids:
+                db.session.execute(db.delete(Token).where(Token.id.in_(ids)))
+                deleted += len(ids)
+            db.session.commit()
+            if len(ids) < batch_size:
+                return deleted
 
     @staticmethod
-    def from_jwt(access_token_jwt):
+    def decode_jwt(access_token_jwt):
+        """Return the opaque access token wrapped by a JWT, or None if it is invalid."""
         try:
-            access_token = jwt.decode(access_token_jwt,
-                                      current_app.config['SECRET_KEY'],
-                                      algorithms=['HS256'])['token']
-            return db.session.query(Token).filter_by(access_token=access_token).scalar()
+            # expired access tokens are still accepted to refresh them
+            return jwt.decode(access_token_jwt,
+                              current_app.config['SECRET_KEY'],
+                              algorithms=['HS256'],
+                              options={'verify_exp': False}).get('token')
         except jwt.PyJWTError:
             pass
 
+    @staticmethod
+    def from_jwt(access_token_jwt):
+        access_token = Token.decode_jwt(access_token_jwt)
+        if access_token:
+            return db.session.query(Token).filter_by(access_token=access_token).scalar()
+
 
 class User(Updateable, db.Model):
     __tablename__ = "user"
@@ -70,6 +104,7 @@ class User(Updateable, db.Model):
     username = db.Column(db.String(255), nullable=False, unique=True)
     email = db.Column(db.String(255), nullable=False, unique=True)
     password_hash = db.Column(db.String(255))
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     projects = db.relationship('Project', backref='owner')
 
@@ -86,10 +121,10 @@ class User(Updateable, db.Model):
 
     @password.setter
     def password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def verify_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
 
     def generate_auth_token(self):
         token = Token(user=self)
@@ -98,11 +133,38 @@ class User(Updateable, db.Model):
 
     @staticmethod
     def verify_access_token(access_token_jwt):
-        token = Token.from_jwt(access_token_jwt)
+        if current_app.config['ACCESS_TOKEN_STATELESS']:
+            return User.verify_stateless_access_token(access_token_jwt)
+        access_token = Token.decode_jwt(access_token_jwt)
+        if not access_token:
+            return
+        user_id = token_cache.get(access_token)
+        if user_id is not None:
+            return db.session.get(User, user_id)
+        token = db.session.query(Token).filter_by(access_token=access_token).scalar()
         if token:
             if token.access_expiration > datetime.now():
+                token_cache.set(access_token, token.user_id, token.access_expiration)
                 return token.user
 
+    @staticmethod
+    def verify_stateless_access_token(access_token_jwt):
+        """Authenticate from the claims of the JWT, without the token table.
+
+        The token is accepted while it has not expired and its version matches
+        the version of the user, which `revoke_all` increments.
+        """
+        try:
+            claims = jwt.decode(access_token_jwt,
+                                current_app.config['SECRET_KEY'],
+                                algorithms=['HS256'],
+                                options={'require': ['sub', 'exp', 'ver']})
+        except jwt.PyJWTError:
+            return
+        user = db.session.get(User, int(claims['sub']))
+        if user and user.token_version == claims['ver']:
+            return user
+
     @staticmethod
     def verify_refresh_token(refresh_token, access_token_jwt):
         token = Token.from_jwt(access_token_jwt)
@@ -117,7 +179,9 @@ class User(Updateable, db.Model):
 
     def revoke_all(self):
         db.session.query(Token).where(Token.user == self).delete()
+        self.token_version = (self.token_version or 0) + 1
         db.session.commit()
+        token_cache.invalidate_user(self.id)
 
     def generate_reset_token(self):
         return jwt.encode(
@@ -152,11 +216,15 @@ class Project(Updateable, db.Model):
     expected_budget = db.Column(db.DECIMAL, default=0)
     total_cost_products = db.Column(db.DECIMAL)
     total_cost_members = db.Column(db.DECIMAL)
+    # incremented on every commit that writes the project or its rows
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    # member costs depend on the current date, the totals are only valid on this day
+    costs_computed_on = db.Column(db.Date)
 
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
-    members = db.relationship('Member', backref='project')
-    tasks = db.relationship('Task', backref='project')
-    products = db.relationship('Product', backref='project')
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
+    members = db.relationship('Member', backref='project', order_by='Member.id')
+    tasks = db.relationship('Task', backref='project', order_by='Task.id')
+    products = db.relationship('Product', backref='project', order_by='Product.id')
 
     def __repr__(self):
         return '<Project {}-{}-{}>'.format(self.id, self.name_project, self.user_id)
@@ -166,24 +234,65 @@ class Project(Updateable, db.Model):
         return url_for('projects.get_project', project_id=self.id)
 
     def update_budget(self):
-        self.calc_cost_total_member()
-        self.calc_cost_total_products()
-        self.calc_budget()
-        db.session.add(self)
-        db.session.commit()
+        """Recompute the budget from every member and product of the project, the caller commits."""
+        with metrics.budget_update_duration.labels(mode='full').time():
+            self.calc_cost_total_member()
+            self.calc_cost_total_products()
+            self.calc_budget()
+            self.costs_computed_on = date.today()
+            db.session.add(self)
+
+    def apply_cost_delta(self, members=0, products=0):
+        """Apply the cost change of the rows written in the session to the budget, the caller commits.
+
+        The totals are incremented by the database in the transaction of the
+        rows, so concurrent writes to the project add up, and the budget is
+        computed from the totals stored afterwards. Totals computed on a
+        previous day are recomputed instead, as the member costs changed
+        since.
+        """
+        if (self.total_cost_members is None or self.total_cost_products is None
+                or self.costs_computed_on != date.today()):
+            return self.update_budget()
+        with metrics.budget_update_duration.labels(mode='delta').time():
+            db.session.execute(db.update(Project)
+                               .where(Project.id == self.id)
+                               .values(total_cost_members=Project.total_cost_members + members,
+                                       total_cost_products=Project.total_cost_products + products)
+                               .execution_options(synchronize_session=False))
+            totals = db.session.execute(db.select(Project.total_cost_members, Project.total_cost_products)
+                                        .where(Project.id == self.id)).one()
+            set_committed_value(self, 'total_cost_members', totals.total_cost_members)
+            set_committed_value(self, 'total_cost_products', totals.total_cost_products)
+            self.calc_budget()
+
+    def check_budget(self):
+        """Return the stored and expected values of the totals that are out of date."""
+        expected = {
+            'total_cost_members': self.members_cost(),
+            'total_cost_products': self.products_cost(),
+        }
+        expected['budget'] = expected['total_cost_members'] + expected['total_cost_products']
+        return {name: (getattr(self, name), value) for name, value in expected.items()
+                if getattr(self, name) != value}
 
     def total_months(self):
         delta = relativedelta.relativedelta(self.deadline, self.created_at)
         return delta.months + (delta.years * 12)
 
-    def calc_cost_total_products(self):
+    def members_cost(self):
+        return Member.sum_total_costs(Member.project_id == self.id)
+
+    def products_cost(self):
         no_license_cost = Product.calc_no_license_products_total_cost(self.id)
         license_cost = Product.calc_license_products_total_cost(self.id)
-        self.total_cost_products = license_cost + no_license_cost
+        return license_cost + no_license_cost
+
+    def calc_cost_total_products(self):
+        self.total_cost_products = self.products_cost()
 
     def calc_cost_total_member(self):
-        members = db.session.get(Project, self.id).members
-        self.total_cost_members = sum(member.calc_total_cost() for member in members)
+        self.total_cost_members = self.members_cost()
 
     def calc_budget(self):
         self.budget = self.total_cost_members + self.total_cost_products
@@ -191,7 +300,8 @@ class Project(Updateable, db.Model):
 
 task_member = db.Table('member_task',
                        db.Column('task_id', db.Integer, db.ForeignKey('task.id'), primary_key=True),
-                       db.Column('member_id', db.Integer, db.ForeignKey('member.id'), primary_key=True))
+                       db.Column('member_id', db.Integer, db.ForeignKey('member.id'), primary_key=True,
+                                 index=True))
 
 
 class Task(Updateable, db.Model):
@@ -203,7 +313,7 @@ class Task(Updateable, db.Model):
     deadline = db.Column(db.Date)
     created_at = db.Column(db.Date, default=date.today)
 
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'))
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), index=True)
     members = db.relationship('Member', secondary=task_member, backref='tasks')
 
     def __repr__(self):
@@ -233,7 +343,7 @@ class Member(Updateable, db.Model):
     role = db.Column(db.String(255), nullable=False)
     salary = db.Column(db.Integer)
 
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'))
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), index=True)
 
     def __repr__(self):
         return '<Member {}-{}-{}>'.format(self.id, self.name_member, self.role)
@@ -250,21 +360,44 @@ class Member(Updateable, db.Model):
         return task in self.tasks
 
     def calc_total_cost(self):
-        longest_task = date.today()
-        longest_task_months = 0
-        for task in self.tasks:
-            if task.deadline > longest_task:
-                longest_task = task.deadline
-                longest_task_months = task.total_months()
-        return self.salary * longest_task_months
+        return db.session.execute(Member.select_total_costs(Member.id == self.id)).one().total_cost
 
     @staticmethod
     def calc_costs_for_all_members(project_id):
-        members = db.session.get(Project, project_id).members
-        all_members_cost = []
-        for member in members:
-            all_members_cost.append({'member': member.name_member, 'total_cost': member.calc_total_cost()})
-        return all_members_cost
+        rows = db.session.execute(Member.select_total_costs(Member.project_id == project_id))
+        return [{'member': row.name_member, 'total_cost': row.total_cost} for row in rows]
+
+    @staticmethod
+    def sum_total_costs(*criteria):
+        rows = db.session.execute(Member.select_total_costs(*criteria))
+        return sum(row.total_cost for row in rows)
+
+    @staticmethod
+    def select_total_costs(*criteria):
+        """Select the id, name and total cost of the members matching criteria.
+
+        The cost of a member is its salary times the months of its latest
+        unfinished task, computed for every member in a single grouped query.
+        """
+        active = (db.select(task_member.c.member_id, Task.created_at, Task.deadline)
+                  .join(Task, Task.id == task_member.c.task_id)
+                  .join(Member, Member.id == task_member.c.member_id)
+                  .where(Task.deadline > date.today(), *criteria)
+                  .subquery())
+        latest = (db.select(active.c.member_id, db.func.max(active.c.deadline).label('deadline'))
+                  .group_by(active.c.member_id)
+                  .subquery())
+        months = (db.select(active.c.member_id,
+                            db.func.max(months_between(active.c.created_at, active.c.deadline)).label('months'))
+                  .join(latest, db.and_(latest.c.member_id == active.c.member_id,
+                                        latest.c.deadline == active.c.deadline))
+                  .group_by(active.c.member_id)
+                  .subquery())
+        return (db.select(Member.id, Member.name_member,
+                          (Member.salary * db.func.coalesce(months.c.months, 0)).label('total_cost'))
+                .outerjoin(months, months.c.member_id == Member.id)
+                .where(*criteria)
+                .order_by(Member.id))
 
 
 class ProductType(enum.Enum):
@@ -275,6 +408,10 @@ class ProductType(enum.Enum):
 
 class Product(Updateable, db.Model):
     __tablename__ = "product"
+    __table_args__ = (
+        # also serves the lookups by project_id alone
+        db.Index('ix_product_project_id_license', 'project_id', 'license'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name_product = db.Column(db.String(255), unique=True, nullable=False)
@@ -293,6 +430,12 @@ class Product(Updateable, db.Model):
     def url(self):
         return url_for('projects.products.get_product', project_id=self.project_id, product_id=self.id)
 
+    def calc_total_cost(self, total_months=None):
+        cost = self.cost * self.amount
+        if self.license:
+            cost *= total_months if total_months is not None else self.project.total_months()
+        return cost
+
     @staticmethod
     def calc_no_license_products_total_cost(project_id):
         total_cost = (db.session.query(db.func.sum(Product.cost * Product.amount))
@@ -325,8 +468,237 @@ class Product(Updateable, db.Model):
 
         total_costs = {ptype.value: 0 for ptype in ProductType}
         for product in products:
-            cost = product.cost * product.amount
-            if product.license:
-                cost *= total_months
-            total_costs[product.type.value] += cost
+            total_costs[product.type.value] += product.calc_total_cost(total_months)
         return total_costs
+
+
+class ProjectCostSummary(db.Model):
+    """Cost reports of a project, kept up to date on every write of its rows."""
+    __tablename__ = "project_cost_summary"
+
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), primary_key=True)
+    license_cost = db.Column(db.BigInteger, nullable=False, default=0)
+    no_license_cost = db.Column(db.BigInteger, nullable=False, default=0)
+    costs_by_type = db.Column(db.JSON, nullable=False)
+    members = db.Column(db.JSON, nullable=False)
+    computed_on = db.Column(db.Date, nullable=False)
+
+    def __repr__(self):
+        return '<ProjectCostSummary {}-{}>'.format(self.project_id, self.computed_on)
+
+    def costs_by_license(self):
+        return {
+            "no_license_cost": self.no_license_cost,
+            "license_cost": self.license_cost
+        }
+
+    @staticmethod
+    def calc(project_id):
+        """Compute the cost reports of a project from its rows."""
+        project = db.session.get(Project, project_id)
+        if project is None:
+            return None
+        total_months = project.total_months()
+        rows = db.session.execute(
+            db.select(Product.type, Product.license, db.func.sum(Product.cost * Product.amount))
+            .where(Product.project_id == project_id)
+            .group_by(Product.type, Product.license)
+        )
+        summary = {
+            'project_id': project_id,
+            'license_cost': 0,
+            'no_license_cost': 0,
+            'costs_by_type': {ptype.value: 0 for ptype in ProductType},
+            'members': Member.calc_costs_for_all_members(project_id),
+            'computed_on': date.today(),
+        }
+        for ptype, license, cost in rows:
+            if license:
+                cost *= total_months
+                summary['license_cost'] += cost
+            else:
+                summary['no_license_cost'] += cost
+            if ptype is not None:
+                summary['costs_by_type'][ptype.value] += cost
+        return summary
+
+    @staticmethod
+    def rebuild(project_id):
+        """Replace the stored cost reports of a project."""
+        table = ProjectCostSummary.__table__
+        db.session.execute(table.delete().where(table.c.project_id == project_id))
+        summary = ProjectCostSummary.calc(project_id)
+        if summary is not None:
+            db.session.execute(table.insert().values(**summary))
+
+    @staticmethod
+    def apply(project_id, changes):
+        """Apply the cost changes of the rows written to a project to its stored reports.
+
+        The reports are rebuilt when they are missing, were computed on a
+        previous day (member costs depend on the current date) or when the
+        changes cannot be applied as deltas.
+        """
+        table = ProjectCostSummary.__table__
+        row = db.session.execute(
+            db.select(table).where(table.c.project_id == project_id).with_for_update()
+        ).one_or_none()
+        if changes.rebuild or row is None or row.computed_on != date.today():
+            ProjectCostSummary.rebuild(project_id)
+            return
+        values = {}
+        if changes.products:
+            total_months = db.session.get(Project, project_id).total_months()
+            values['license_cost'] = row.license_cost
+            values['no_license_cost'] = row.no_license_cost
+            values['costs_by_type'] = dict(row.costs_by_type)
+            for (ptype, license), cost in changes.products.items():
+                if license:
+                    cost *= total_months
+                    values['license_cost'] += cost
+                else:
+                    values['no_license_cost'] += cost
+                if ptype is not None:
+                    values['costs_by_type'][ptype] += cost
+        if changes.members:
+            values['members'] = Member.calc_costs_for_all_members(project_id)
+        if values:
+            db.session.execute(table.update().where(table.c.project_id == project_id).values(**values))
+
+    @staticmethod
+    def for_project(project_id):
+        """Return the cost reports of a project, storing them again if they are missing or out of date.
+
+        The reports are recomputed from the primary database, the stored
+        ones may have been read from a replica.
+        """
+        summary = db.session.get(ProjectCostSummary, project_id)
+        if summary is None or summary.computed_on != date.today():
+            if summary is not None:
+                db.session.expunge(summary)
+            with replicas.primary(sticky=False):
+                # drop the rows loaded from a replica
+                db.session.expire_all()
+                values = ProjectCostSummary.calc(project_id)
+                if values is None:
+                    return None
+                db.session.merge(ProjectCostSummary(**values))
+                db.session.commit()
+            summary = ProjectCostSummary(**values)
+        return summary
+
+    @staticmethod
+    def mark_stale(project_id):
+        """Rebuild the cost reports and bump the version of a project when the session commits.
+
+        Writes that bypass the ORM unit of work must call this or `mark_changed`.
+        """
+        _summary_changes(db.session, project_id).rebuild = True
+
+    @staticmethod
+    def mark_changed(project_id, members=False, products=()):
+        """Record rows written to a project without the ORM unit of work.
+
+        Pass members=True when the cost of its members may have changed and
+        products with the inserted product rows, as dicts of column values.
+        The changes are applied to the cost reports when the session commits.
+        """
+        changes = _summary_changes(db.session, project_id)
+        changes.members = changes.members or members
+        for values in products:
+            changes.add_product(values)
+
+
+class _SummaryChanges:
+    """Cost changes of the rows of a project written in the current transaction."""
+
+    def __init__(self):
+        self.rebuild = False
+        self.members = False
+        # cost * amount of the products by (type, license)
+        self.products = Counter()
+
+    def add_product(self, values, sign=1):
+        ptype = values.get('type')
+        cost = (values.get('cost') or 0) * (values.get('amount') or 0)
+        self.products[(ProductType(ptype).value if ptype is not None else None, bool(values.get('license')))] += \
+            sign * cost
+
+
+_PRODUCT_COST_COLUMNS = ('project_id', 'type', 'license', 'cost', 'amount')
+
+
+def _summary_changes(session, project_id):
+    return session.info.setdefault('cost_summary_changes', {}).setdefault(project_id, _SummaryChanges())
+
+
+def _product_values(session, product, old):
+    """Return the cost columns of a flushed product before or after the flush, None if they were not loaded."""
+    values = {}
+    for key in _PRODUCT_COST_COLUMNS:
+        history = db.inspect(product).attrs[key].history
+        if old and history.deleted:
+            values[key] = history.deleted[0]
+        elif not old and history.added:
+            values[key] = history.added[0]
+        elif history.unchanged:
+            values[key] = history.unchanged[0]
+        elif product in session.new:
+            values[key] = None
+        else:
+            return None
+    return values
+
+
+def _collect_product(session, product):
+    before = None if product in session.new else _product_values(session, product, old=True)
+    after = None if product in session.deleted else _product_values(session, product, old=False)
+    for values, sign in ((before, -1), (after, 1)):
+        if values is not None and values['project_id'] is not None:
+            _summary_changes(session, values['project_id']).add_product(values, sign)
+    if (before is None and product not in session.new) or (after is None and product not in session.deleted):
+        for project_id in {product.project_id, *db.inspect(product).attrs.project_id.history.deleted} - {None}:
+            _summary_changes(session, project_id).rebuild = True
+
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_cost_summary_changes(session, flush_context):
+    for obj in session.new | session.dirty | session.deleted:
+        if isinstance(obj, Project):
+            changes = _summary_changes(session, obj.id)
+            attrs = db.inspect(obj).attrs
+            # license costs depend on the duration of the project
+            if (obj in session.new or obj in session.deleted
+                    or attrs.created_at.history.has_changes() or attrs.deadline.history.has_changes()):
+                changes.rebuild = True
+        elif isinstance(obj, Product):
+            _collect_product(session, obj)
+        elif isinstance(obj, (Member, Task)):
+            for project_id in {obj.project_id, *db.inspect(obj).attrs.project_id.history.deleted} - {None}:
+                _summary_changes(session, project_id).members = True
+        elif isinstance(obj, User) and obj in session.dirty:
+            # projects embed the username and email of their owner
+            attrs = db.inspect(obj).attrs
+            if attrs.username.history.deleted or attrs.email.history.deleted:
+                session.info.setdefault('changed_owners', set()).add(obj.id)
+    session.info.get('cost_summary_changes', {}).pop(None, None)
+
+
+@event.listens_for(db.session, 'before_commit')
+def _apply_cost_summary_changes(session):
+    session.flush()
+    changes = session.info.pop('cost_summary_changes', {})
+    owners = session.info.pop('changed_owners', set())
+    for project_id in sorted(changes):
+        ProjectCostSummary.apply(project_id, changes[project_id])
+    if changes or owners:
+        session.execute(db.update(Project)
+                        .where(db.or_(Project.id.in_(changes), Project.user_id.in_(owners)))
+                        .values(version=Project.version + 1)
+                        .execution_options(synchronize_session=False))
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _discard_cost_summary_changes(session, previous_transaction):
+    session.info.pop('cost_summary_changes', None)
+    session.info.pop('changed_owners', None)
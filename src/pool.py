@@ -0,0 +1,44 @@
+from sqlalchemy.pool import QueuePool
+
+# used by QueuePool when SQLALCHEMY_ENGINE_OPTIONS does not set max_overflow
+DEFAULT_MAX_OVERFLOW = 10
+
+
+def pool_stats(engine, engine_options):
+    """Return the state of the connection pool of an engine, or None if the pool does not report it.
+
+    The pool does not expose its maximum overflow, it is read from the
+    engine_options the engine was created with.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    return {
+        'size': pool.size(),
+        'max_overflow': engine_options.get('max_overflow', DEFAULT_MAX_OVERFLOW),
+        'checked_in': pool.checkedin(),
+        'checked_out': pool.checkedout(),
+        # negative until the pool has opened pool_size connections
+        'overflow': max(pool.overflow(), 0),
+        'timeout': pool.timeout(),
+    }
+
+
+def check_pool_size(app, engine):
+    """Warn when the pool cannot give a connection to every WSGI thread at once.
+
+    Threads that find the pool exhausted wait up to the pool timeout and then
+    fail, so the pool size should be at least ``WSGI_THREADS``, leaving the
+    overflow for the background threads.
+    """
+    stats = pool_stats(engine, app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    if stats is None:
+        return
+    threads = app.config['WSGI_THREADS']
+    if stats['max_overflow'] >= 0 and stats['size'] + stats['max_overflow'] < threads:
+        app.logger.warning('The database pool holds at most %d connections for %d WSGI threads, requests will '
+                           'fail after waiting %s seconds for a connection; raise DB_POOL_SIZE or DB_MAX_OVERFLOW',
+                           stats['size'] + stats['max_overflow'], threads, stats['timeout'])
+    elif stats['size'] < threads:
+        app.logger.warning('The database pool keeps %d connections open for %d WSGI threads, busy periods will '
+                           'open and close overflow connections; raise DB_POOL_SIZE', stats['size'], threads)
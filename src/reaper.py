@@ -0,0 +1,93 @@
+import logging
+from threading import Event, Lock, Thread
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class TokenReaper:
+    """Delete expired tokens from a background thread.
+
+    Every ``TOKEN_REAPER_INTERVAL`` seconds the thread removes the tokens that
+    expired more than a day ago, ``TOKEN_REAPER_BATCH_SIZE`` rows at a time.
+    The thread starts with the first request, so CLI commands never run it.
+    An interval of 0, the default, disables the thread; the ``flask tokens
+    reap`` command does the same work and can be run from cron instead. Each app gets its
+    own `TokenReaperState` in ``app.extensions['token_reaper']``.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        previous = app.extensions.get('token_reaper')
+        if previous is None:
+            app.before_request(self._start)
+        else:
+            previous.stop()
+        app.extensions['token_reaper'] = TokenReaperState(app, app.config['TOKEN_REAPER_INTERVAL'],
+                                                          app.config['TOKEN_REAPER_BATCH_SIZE'])
+
+    @staticmethod
+    def state():
+        return current_app.extensions['token_reaper']
+
+    def reap(self):
+        """Delete the expired tokens and return how many were deleted."""
+        return self.state().reap()
+
+    def stop(self):
+        self.state().stop()
+
+    def _start(self):
+        state = self.state()
+        if state.interval > 0 and state._thread is None:
+            state.start()
+
+
+class TokenReaperState:
+    """The settings and thread of the token reaper of one app."""
+
+    def __init__(self, app, interval=0, batch_size=1000):
+        self.app = app
+        self.interval = interval
+        self.batch_size = batch_size
+        self._thread = None
+        self._stopped = Event()
+        self._lock = Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = Thread(target=self._run, name='token-reaper', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            if self._thread is not None:
+                self._stopped.set()
+                self._thread.join()
+                self._thread = None
+
+    def reap(self):
+        from .extensions import db
+        from .models import Token
+
+        with self.app.app_context():
+            try:
+                return Token.clean(self.batch_size)
+            finally:
+                db.session.remove()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                deleted = self.reap()
+            except Exception:
+                logger.exception('Could not delete the expired tokens')
+            else:
+                logger.info('Deleted %d expired tokens', deleted)
@@ -0,0 +1,157 @@
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from threading import Lock
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, inspect
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingSession(Session):
+    """Session that sends the queries of read-only requests to a replica.
+
+    Flushes, DML statements and everything outside of a GET request go to
+    the primary database.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not getattr(clause, 'is_dml', False):
+            from .extensions import replicas
+
+            replica = replicas.engine_for_request()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class Replicas:
+    """Route read-only requests to the databases in ``DATABASE_REPLICA_URIS``.
+
+    A replica is picked at random for each GET request. For
+    ``REPLICA_STICKY_SECONDS`` after a request of a user writes to the
+    database, the reads of that user go to the primary so that they see their
+    own writes before they reach the replicas. Authentication always reads
+    from the primary, tokens are used right after they are created.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        previous = app.extensions.get('replicas')
+        if previous is None:
+            app.after_request(self._after_request)
+        else:
+            previous.dispose()
+        options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+        app.extensions['replicas'] = ReplicasState(
+            [create_engine(uri, **options) for uri in app.config['DATABASE_REPLICA_URIS']],
+            timedelta(seconds=app.config['REPLICA_STICKY_SECONDS']))
+
+    @staticmethod
+    def state():
+        return current_app.extensions['replicas']
+
+    @contextmanager
+    def primary(self, sticky=True):
+        """Send the queries made inside the block to the primary database.
+
+        With sticky=False the writes made inside the block do not make the
+        user sticky, for data derived from rows the user did not write.
+        """
+        previous = g.get('db_primary', False)
+        wrote = g.get('db_wrote', False)
+        g.db_primary = True
+        try:
+            yield
+        finally:
+            g.db_primary = previous
+            if not sticky:
+                g.db_wrote = wrote
+
+    def engine_for_request(self):
+        if not has_request_context() or request.method not in READ_METHODS:
+            return None
+        state = self.state()
+        if not state.engines or g.get('db_primary') or state.is_sticky(_current_user_id()):
+            return None
+        if 'db_replica' not in g:
+            g.db_replica = random.randrange(len(state.engines))
+        return state.engines[g.db_replica]
+
+    def is_sticky(self, user_id):
+        return self.state().is_sticky(user_id)
+
+    def _after_request(self, response):
+        state = self.state()
+        user_id = _current_user_id()
+        if state.engines and user_id is not None and g.get('db_wrote') and response.status_code < 400:
+            state.make_sticky(user_id)
+        return response
+
+
+class ReplicasState:
+    """The replica engines and sticky users of one app."""
+
+    def __init__(self, engines=(), sticky=timedelta(0)):
+        self.engines = list(engines)
+        self.sticky = sticky
+        self.sticky_users = {}
+        self._lock = Lock()
+
+    def dispose(self):
+        for engine in self.engines:
+            engine.dispose()
+
+    def is_sticky(self, user_id):
+        if user_id is None:
+            return False
+        with self._lock:
+            until = self.sticky_users.get(user_id)
+            if until is not None and until <= datetime.now():
+                del self.sticky_users[user_id]
+                until = None
+        return until is not None
+
+    def make_sticky(self, user_id):
+        now = datetime.now()
+        with self._lock:
+            for expired in [user for user, until in self.sticky_users.items() if until <= now]:
+                del self.sticky_users[expired]
+            self.sticky_users[user_id] = now + self.sticky
+
+
+def _current_user_id():
+    # set by Flask-HTTPAuth once the request is authenticated; the identity
+    # is read from the instance state because loading an expired id would
+    # route a query from here
+    user = g.get('flask_httpauth_user')
+    if user:
+        identity = inspect(user).identity
+        return identity[0] if identity else None
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(session, flush_context):
+    if not has_request_context():
+        return
+    # tokens are always read from the primary, writing them does not make
+    # the user sticky (nor does the user's tokens collection changing)
+    written = [*session.new, *session.deleted,
+               *(obj for obj in session.dirty if session.is_modified(obj, include_collections=False))]
+    if any(getattr(obj, '__tablename__', None) != 'token' for obj in written):
+        g.db_wrote = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _do_orm_execute(orm_execute_state):
+    # statements that bypass the unit of work (bulk inserts, in place updates)
+    if not has_request_context() or not (orm_execute_state.is_insert or orm_execute_state.is_update
+                                         or orm_execute_state.is_delete):
+        return
+    if orm_execute_state.statement.table.name != 'token':
+        g.db_wrote = True
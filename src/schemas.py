@@ -4,6 +4,9 @@ from marshmallow import validate
 
 from .extensions import ma
 from .models import User, Project, Member, Task, Product, ProductType
+from .serializers import CompiledDump
+
+MAX_ASSIGNMENTS = 1000
 
 
 class EmptySchema(ma.Schema):
@@ -19,7 +22,7 @@ class TokenSchema(ma.Schema):
     refresh_token = ma.String()
 
 
-class AllUsersSchema(ma.SQLAlchemySchema):
+class AllUsersSchema(CompiledDump, ma.SQLAlchemySchema):
     class Meta:
         model = User
         include_fk = True
@@ -45,12 +48,13 @@ class UserSchema(AllUsersSchema, ma.SQLAlchemySchema):
     projects = ma.Nested(lambda: ProjectSchema(only=['id', 'name_project']), many=True, dump_only=True)
 
 
-class ProjectSchema(ma.SQLAlchemyAutoSchema):
+class ProjectSchema(CompiledDump, ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Project
         include_fk = True
         include_relationships = True
         ordered = True
+        exclude = ('version', 'costs_computed_on')
 
     id = ma.auto_field(dump_only=True)
     name_project = ma.auto_field(required=True, validate=validate.Length(min=1, max=255))
@@ -69,7 +73,7 @@ class ProjectSchema(ma.SQLAlchemyAutoSchema):
     tasks = ma.Nested(lambda: TaskSchema(only=['id', 'name_task']), many=True, dump_only=True)
 
 
-class MemberSchema(ma.SQLAlchemyAutoSchema):
+class MemberSchema(CompiledDump, ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Member
         include_fk = True
@@ -85,7 +89,7 @@ class MemberSchema(ma.SQLAlchemyAutoSchema):
     tasks = ma.Nested(lambda: TaskSchema(only=['id', 'name_task']), many=True, dump_only=True)
 
 
-class TaskSchema(ma.SQLAlchemyAutoSchema):
+class TaskSchema(CompiledDump, ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Task
         include_fk = True
@@ -102,7 +106,7 @@ class TaskSchema(ma.SQLAlchemyAutoSchema):
     members = ma.Nested(MemberSchema(only=['id', 'name_member', 'role']), many=True, dump_only=True)
 
 
-class ProductSchema(ma.SQLAlchemyAutoSchema):
+class ProductSchema(CompiledDump, ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Product
         include_fk = True
@@ -119,6 +123,48 @@ class ProductSchema(ma.SQLAlchemyAutoSchema):
     project = ma.Nested(ProjectSchema, only=['name_project', 'user_id'], dump_only=True)
 
 
+class PaginationSchema(ma.Schema):
+    class Meta:
+        ordered = True
+
+    limit = ma.Integer(validate=validate.Range(min=1),
+                       metadata={'description': 'Maximum number of items in the page.'})
+    after = ma.Integer(validate=validate.Range(min=0),
+                       metadata={'description': 'Return the items after this id.'})
+    stream = ma.Boolean(metadata={'description': 'Stream the whole collection instead of a page. '
+                                                 'Also enabled by accepting application/x-ndjson.'})
+
+
+class PaginationHeadersSchema(ma.Schema):
+    link = ma.String(data_key='Link', metadata={'description': 'URL of the next page, with rel="next".'})
+
+
+class BulkCreatedSchema(ma.Schema):
+    created = ma.Integer(metadata={'description': 'Number of rows created.'})
+
+
+class AssignmentSchema(ma.Schema):
+    class Meta:
+        ordered = True
+
+    task_id = ma.Integer(required=True)
+    member_id = ma.Integer(required=True)
+
+
+class AssignmentsSchema(ma.Schema):
+    # the pairs are checked and inserted in a single request
+    assignments = ma.Nested(AssignmentSchema, many=True, required=True,
+                            validate=validate.Length(min=1, max=MAX_ASSIGNMENTS))
+
+
+class AssignmentsResultSchema(ma.Schema):
+    class Meta:
+        ordered = True
+
+    assigned = ma.Integer(metadata={'description': 'Number of new assignments.'})
+    skipped = ma.Integer(metadata={'description': 'Number of assignments that already existed.'})
+
+
 class MemberCostSchema(ma.Schema):
     member = ma.String()
     total_cost = ma.Number()
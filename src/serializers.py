@@ -0,0 +1,93 @@
+import datetime
+from collections.abc import Mapping
+
+from flask import current_app, has_app_context
+from marshmallow import fields
+
+
+def compile_dump(schema):
+    """Compile schema into a function that dumps one object to a dict.
+
+    The fields that schema dumps (honoring ``only``, ``exclude`` and
+    ``load_only``) are resolved once, and the common types are converted
+    inline: integers, strings and booleans are returned as they are, dates
+    as ISO strings and enums by name, as marshmallow does. Values of any
+    other type, and fields with a custom format, go through the field's own
+    ``_serialize``. Nested schemas are compiled too.
+
+    Returns None when schema has dump hooks or a field that reads its value
+    in a custom way, which only marshmallow itself can run.
+    """
+    if any(schema._hooks[(tag, many)] for tag in ('pre_dump', 'post_dump') for many in (False, True)):
+        return None
+    compiled = []
+    for name, field in schema.dump_fields.items():
+        attribute = field.attribute or name
+        if '.' in attribute or not field._CHECK_ATTRIBUTE or type(field).get_value is not fields.Field.get_value:
+            return None
+        convert = _compile_field(name, field)
+        if convert is None:
+            return None
+        compiled.append((field.data_key or name, attribute, convert))
+    compiled = tuple(compiled)
+
+    def dump(obj):
+        return {key: convert(getattr(obj, attribute), obj) for key, attribute, convert in compiled}
+    return dump
+
+
+def _compile_field(name, field):
+    serialize = field._serialize
+
+    def fallback(value, obj):
+        return serialize(value, name, obj)
+
+    if type(field) is fields.Nested:
+        schema = field.schema
+        nested_dump = compile_dump(schema)
+        if nested_dump is None:
+            return None
+        if schema.many or field.many:
+            return lambda value, obj: None if value is None else [nested_dump(item) for item in value]
+        return lambda value, obj: None if value is None else nested_dump(value)
+
+    # exact types only, subclasses and other values get marshmallow's conversion
+    if isinstance(field, fields.Integer) and not field.as_string:
+        passthrough = int
+    elif isinstance(field, fields.String):
+        passthrough = str
+    elif isinstance(field, fields.Boolean):
+        passthrough = bool
+    elif isinstance(field, fields.Date) and field.format in (None, 'iso'):
+        return lambda value, obj: (value.isoformat() if type(value) is datetime.date
+                                   else fallback(value, obj))
+    elif isinstance(field, fields.Enum) and not field.by_value:
+        return lambda value, obj: value.name if value is not None else None
+    else:
+        return fallback
+    return lambda value, obj: value if value is None or type(value) is passthrough else fallback(value, obj)
+
+
+class CompiledDump:
+    """Schema mixin that dumps objects with a function compiled by `compile_dump`.
+
+    The function is compiled the first time the schema dumps an object and
+    used while ``SCHEMA_COMPILED_DUMP`` is enabled. Mappings and schemas that
+    cannot be compiled are dumped by marshmallow.
+    """
+
+    def dump(self, obj, *, many=None):
+        compiled = self.__dict__.get('_compiled_dump', False)
+        if compiled is False:
+            compiled = self._compiled_dump = compile_dump(self)
+        if compiled is None or not (has_app_context() and current_app.config['SCHEMA_COMPILED_DUMP']):
+            return super().dump(obj, many=many)
+        many = self.many if many is None else bool(many)
+        if many:
+            obj = list(obj)
+            if any(isinstance(item, Mapping) for item in obj):
+                return super().dump(obj, many=many)
+            return [compiled(item) for item in obj]
+        if isinstance(obj, Mapping):
+            return super().dump(obj, many=many)
+        return compiled(obj)
@@ -0,0 +1,51 @@
+from sqlalchemy import Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+
+class months_between(FunctionElement):
+    """Number of whole months between two dates, as relativedelta counts them.
+
+    A month is only counted when the day of the end date has been reached, or
+    when the end date falls on the last day of its month. When the end date
+    is before the start date the result is negative and, like relativedelta,
+    rounded towards zero.
+    """
+    type = Integer()
+    inherit_cache = True
+    name = 'months_between'
+
+
+@compiles(months_between, 'sqlite')
+def _sqlite_months_between(element, compiler, **kw):
+    start, end = [compiler.process(arg, **kw) for arg in element.clauses]
+    return (
+        f"((CAST(strftime('%Y', {end}) AS INTEGER) - CAST(strftime('%Y', {start}) AS INTEGER)) * 12"
+        f" + CAST(strftime('%m', {end}) AS INTEGER) - CAST(strftime('%m', {start}) AS INTEGER)"
+        f" - ({end} >= {start} AND CAST(strftime('%d', {end}) AS INTEGER) < CAST(strftime('%d', {start}) AS INTEGER)"
+        f" AND strftime('%d', date({end}, '+1 day')) != '01')"
+        f" + ({end} < {start} AND CAST(strftime('%d', {end}) AS INTEGER) > CAST(strftime('%d', {start}) AS INTEGER)))"
+    )
+
+
+@compiles(months_between, 'mysql')
+def _mysql_months_between(element, compiler, **kw):
+    start, end = [compiler.process(arg, **kw) for arg in element.clauses]
+    return (
+        f"((YEAR({end}) - YEAR({start})) * 12 + MONTH({end}) - MONTH({start})"
+        f" - ({end} >= {start} AND DAY({end}) < DAY({start}) AND {end} != LAST_DAY({end}))"
+        f" + ({end} < {start} AND DAY({end}) > DAY({start})))"
+    )
+
+
+@compiles(months_between)
+def _default_months_between(element, compiler, **kw):
+    start, end = [compiler.process(arg, **kw) for arg in element.clauses]
+    return (
+        f"((EXTRACT(YEAR FROM {end}) - EXTRACT(YEAR FROM {start})) * 12"
+        f" + EXTRACT(MONTH FROM {end}) - EXTRACT(MONTH FROM {start})"
+        f" - CASE WHEN {end} >= {start} AND EXTRACT(DAY FROM {end}) < EXTRACT(DAY FROM {start})"
+        f" AND EXTRACT(DAY FROM {end} + INTERVAL '1 day') != 1 THEN 1 ELSE 0 END"
+        f" + CASE WHEN {end} < {start} AND EXTRACT(DAY FROM {end}) > EXTRACT(DAY FROM {start})"
+        f" THEN 1 ELSE 0 END)"
+    )
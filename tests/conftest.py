@@ -16,6 +16,11 @@ def app():
         'MAIL_USERNAME': 'test',
         'MAIL_PASSWORD': 'test',
         'MAIL_DEFAULT_SENDER': 'test@test.com',
+        'SQL_MAX_STATEMENTS': 30,
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'PASSWORD_HASH_WORKERS': 0,
+        'MAIL_QUEUE_WORKERS': 0,
+        'TOKEN_REAPER_INTERVAL': 0,
     })
 
     client = app.test_client()
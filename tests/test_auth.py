@@ -1,9 +1,12 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
+import jwt
 import pytest
+from flask import current_app
+from sqlalchemy import event
 
 from src import db
-from src.models import Token
+from src.models import Token, User
 
 
 def test_create_tokens(database_with_data):
@@ -117,3 +120,88 @@ def test_token_revoked(database_with_data, tokens):
         'access_token': access_token, 'refresh_token': refresh_token
     })
     assert response.status_code == 401
+
+
+
+@pytest.fixture
+def stateless(app):
+    config = app.application.config
+    config['ACCESS_TOKEN_STATELESS'] = True
+    yield
+    config['ACCESS_TOKEN_STATELESS'] = False
+
+
+def test_stateless_access_token(database_with_data, stateless, tokens):
+    """
+    Given the stateless access token mode,
+    When a protected route is requested,
+    Then the user should be authenticated without reading the token table.
+    """
+    access_token, _ = tokens
+    claims = jwt.decode(access_token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+    assert claims['sub'] == '1'
+    assert claims['ver'] == 0
+
+    statements = []
+    engine = db.engine
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        response = database_with_data.get('api/v1/users/me', headers={'Authorization': f'Bearer {access_token}'})
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+    assert response.status_code == 200
+    assert not [statement for statement in statements if 'FROM token' in statement]
+
+
+def test_stateless_access_token_expired(database_with_data, stateless):
+    """
+    Given the stateless access token mode,
+    When the access token is expired,
+    Then the access token should be invalid.
+    """
+    user = db.session.get(User, 1)
+    token = user.generate_auth_token()
+    token.access_expiration = datetime.now() - timedelta(minutes=1)
+    db.session.add(token)
+    db.session.commit()
+
+    response = database_with_data.get('api/v1/users/me', headers={'Authorization': f'Bearer {token.access_token_jwt}'})
+    assert response.status_code == 401
+
+
+def test_stateless_revoke_all(database_with_data, stateless, tokens):
+    """
+    Given the stateless access token mode,
+    When all the tokens of the user are revoked,
+    Then the outstanding access tokens should be invalid.
+    """
+    access_token, _ = tokens
+    db.session.get(User, 1).revoke_all()
+
+    response = database_with_data.get('api/v1/users/me', headers={'Authorization': f'Bearer {access_token}'})
+    assert response.status_code == 401
+
+
+def test_stateless_refresh_token(database_with_data, stateless, tokens):
+    """
+    Given the stateless access token mode and an expired access token,
+    When the user refreshes the tokens,
+    Then the user should receive new tokens.
+    """
+    access_token, refresh_token = tokens
+    token = Token.from_jwt(access_token)
+    token.access_expiration = datetime.now() - timedelta(minutes=1)
+    db.session.commit()
+    expired_jwt = token.access_token_jwt
+
+    response = database_with_data.put('api/v1/tokens', json={
+        'access_token': expired_jwt, 'refresh_token': refresh_token
+    })
+    assert response.status_code == 200
+    response = database_with_data.get('api/v1/users/me',
+                                      headers={'Authorization': f'Bearer {response.json["access_token"]}'})
+    assert response.status_code == 200
@@ -126,3 +126,67 @@ def test_assign_task(database_with_data, access_token_valid):
     assert response.json['salary'] == 1000
     assert response.json['project_id'] == 1
     assert response.json['tasks'][0]['id'] == 1
+
+
+def test_assign_task_updates_budget(database_with_data, access_token_valid):
+    """
+    Given the protected endpoint /projects/<project_id>/members/<member_id>/<task_id>,
+    When a task is assigned to members of a project with a budget,
+    Then the cost of the members should be added to the project budget.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    database_with_data.put('api/v1/projects/1', json={'name_project': 'test_project'}, headers=headers)
+
+    database_with_data.put('api/v1/projects/1/members/1/1', headers=headers)
+    database_with_data.put('api/v1/projects/1/members/2/1', headers=headers)
+    response = database_with_data.get('api/v1/projects/1', headers=headers)
+    assert float(response.json['total_cost_members']) == 6600
+
+    database_with_data.delete('api/v1/projects/1/members/2', headers=headers)
+    response = database_with_data.get('api/v1/projects/1', headers=headers)
+    assert float(response.json['total_cost_members']) == 6000
+
+
+def test_new_members_bulk(database_with_data, access_token_valid):
+    """
+    Given the protected endpoint /projects/<project_id>/members/bulk,
+    When the method is POST and the user provides a JSON array of valid members,
+    Then the user should receive a 201 status code and all the members should be created.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    response = database_with_data.post('api/v1/projects/1/members/bulk', json=[
+        {'name_member': f'bulk_member{i}', 'role': 'test_role', 'salary': 100} for i in range(50)
+    ], headers=headers)
+    assert response.status_code == 201
+    assert response.json['created'] == 50
+
+    response = database_with_data.get('api/v1/projects/1/members?limit=100', headers=headers)
+    assert len(response.json) == 52
+    assert response.json[-1]['name_member'] == 'bulk_member49'
+
+
+def test_new_members_bulk_invalid_rows(database_with_data, access_token_valid):
+    """
+    Given the protected endpoint /projects/<project_id>/members/bulk,
+    When the method is POST and some rows are invalid or already exist,
+    Then the user should receive a 400 status code with the errors of each row and no member should be created.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    response = database_with_data.post('api/v1/projects/1/members/bulk', json=[
+        {'name_member': 'bulk_member', 'role': 'test_role', 'salary': 100},
+        {'name_member': 'bulk_member2', 'role': 'test_role', 'salary': 'a lot'},
+    ], headers=headers)
+    assert response.status_code == 400
+    assert list(response.json['errors']['json']) == ['1']
+    assert 'salary' in response.json['errors']['json']['1']
+
+    response = database_with_data.post('api/v1/projects/1/members/bulk', json=[
+        {'name_member': 'bulk_member', 'role': 'test_role', 'salary': 100},
+        {'name_member': 'test_member', 'role': 'test_role', 'salary': 100},
+        {'name_member': 'bulk_member', 'role': 'test_role', 'salary': 100},
+    ], headers=headers)
+    assert response.status_code == 400
+    assert sorted(response.json['errors']['json']) == ['1', '2']
+
+    response = database_with_data.get('api/v1/projects/1/members', headers=headers)
+    assert len(response.json) == 2
@@ -1,3 +1,5 @@
+import io
+
 import pytest
 
 invalid_products_id = [0, -1, 1.5, 99999999999999]
@@ -128,3 +130,63 @@ def test_delete_product(database_with_data, access_token_valid):
     response = database_with_data.delete('api/v1/projects/1/products/1', headers={
         'Authorization': f'Bearer {access_token_valid}'})
     assert response.status_code == 204
+
+
+def test_new_products_bulk_csv(database_with_data, access_token_valid):
+    """
+    Given the protected endpoint /projects/<project_id>/products/bulk,
+    When the method is POST and the user uploads a CSV file of valid products,
+    Then the user should receive a 201 status code and the project budget should include the products.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    csv = (
+        'name_product,description_product,cost,license,type,amount\n'
+        'bulk_hardware,,100,false,HARDWARE,2\n'
+        'bulk_software,monthly,10,true,SOFTWARE,1\n'
+    )
+    response = database_with_data.post('api/v1/projects/1/products/bulk', data={
+        'file': (io.BytesIO(csv.encode()), 'products.csv')
+    }, headers=headers)
+    assert response.status_code == 201
+    assert response.json['created'] == 2
+
+    response = database_with_data.get('api/v1/projects/1', headers=headers)
+    assert float(response.json['total_cost_products']) == 7770 + 200 + 60
+
+    response = database_with_data.get('api/v1/projects/1/products_by_type', headers=headers)
+    assert response.json['HARDWARE'] == 7200
+
+
+def test_new_products_bulk_csv_body(database_with_data, access_token_valid):
+    """
+    Given the protected endpoint /projects/<project_id>/products/bulk,
+    When the method is POST and the body is a CSV document with an invalid row,
+    Then the user should receive a 400 status code with the errors of the row.
+    """
+    response = database_with_data.post('api/v1/projects/1/products/bulk', data=(
+        'name_product,cost,license,type,amount\n'
+        'bulk_product,10,false,FURNITURE,1\n'
+    ), content_type='text/csv', headers={'Authorization': f'Bearer {access_token_valid}'})
+    assert response.status_code == 400
+    assert 'type' in response.json['errors']['csv']['0']
+
+
+def test_new_products_bulk_csv_not_utf8(database_with_data, access_token_valid):
+    """
+    Given the protected endpoint /projects/<project_id>/products/bulk,
+    When the method is POST and the uploaded CSV file or CSV body is not encoded in UTF-8,
+    Then the user should receive a 400 status code.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    csv = 'name_product,cost,license,type,amount\nprodução,10,false,HARDWARE,1\n'.encode('latin-1')
+
+    response = database_with_data.post('api/v1/projects/1/products/bulk', data={
+        'file': (io.BytesIO(csv), 'products.csv')
+    }, headers=headers)
+    assert response.status_code == 400
+    assert 'files' in response.json['errors']
+
+    response = database_with_data.post('api/v1/projects/1/products/bulk', data=csv, content_type='text/csv',
+                                       headers=headers)
+    assert response.status_code == 400
+    assert 'csv' in response.json['errors']
@@ -2,6 +2,8 @@ from datetime import date, timedelta
 
 import pytest
 
+from src.schemas import MAX_ASSIGNMENTS
+
 invalid_tasks_id = [0, -1, 1.5, 99999999999999]
 
 
@@ -121,3 +123,90 @@ def test_assing_member(database_with_data, access_token_valid):
         'Authorization': f'Bearer {access_token_valid}'})
     assert response.status_code == 200
     assert response.json['members'][0]['id'] == 1
+
+
+def test_new_tasks_bulk(database_with_data, access_token_valid):
+    """
+    Given the protected endpoint /projects/<project_id>/tasks/bulk,
+    When the method is POST and the user provides a JSON array of valid tasks,
+    Then the user should receive a 201 status code and all the tasks should be created.
+    """
+    deadline = (date.today() + timedelta(days=60)).isoformat()
+    response = database_with_data.post('api/v1/projects/1/tasks/bulk', json=[
+        {'name_task': 'bulk_task1', 'deadline': deadline},
+        {'name_task': 'bulk_task2', 'description_task': 'test_description', 'deadline': deadline},
+    ], headers={'Authorization': f'Bearer {access_token_valid}'})
+    assert response.status_code == 201
+    assert response.json['created'] == 2
+
+
+def test_new_tasks_bulk_not_a_list(database_with_data, access_token_valid):
+    """
+    Given the protected endpoint /projects/<project_id>/tasks/bulk,
+    When the method is POST and the body is not a JSON array,
+    Then the user should receive a 400 status code.
+    """
+    response = database_with_data.post('api/v1/projects/1/tasks/bulk', json={'name_task': 'bulk_task'},
+                                       headers={'Authorization': f'Bearer {access_token_valid}'})
+    assert response.status_code == 400
+
+
+def test_assign_members(database_with_data, access_token_valid):
+    """
+    Given the protected endpoint /projects/<project_id>/tasks/assignments,
+    When the method is PUT and the user provides task and member pairs,
+    Then the user should receive a 200 status code and the new pairs should be assigned.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    database_with_data.put('api/v1/projects/1/members/1/1', headers=headers)
+
+    response = database_with_data.put('api/v1/projects/1/tasks/assignments', json={'assignments': [
+        {'task_id': 1, 'member_id': 1},
+        {'task_id': 1, 'member_id': 2},
+        {'task_id': 1, 'member_id': 2},
+    ]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json == {'assigned': 1, 'skipped': 1}
+
+    response = database_with_data.get('api/v1/projects/1/tasks/1', headers=headers)
+    assert [member['id'] for member in response.json['members']] == [1, 2]
+
+    response = database_with_data.get('api/v1/projects/1', headers=headers)
+    assert float(response.json['total_cost_members']) == 6600
+
+    response = database_with_data.get('api/v1/projects/1/members_costs', headers=headers)
+    assert response.json['Members'][1]['total_cost'] == 600
+
+
+def test_assign_members_too_many(database_with_data, access_token_valid):
+    """
+    Given the protected endpoint /projects/<project_id>/tasks/assignments,
+    When the method is PUT and the user provides more pairs than allowed,
+    Then the user should receive a 400 status code and no pair should be assigned.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    response = database_with_data.put('api/v1/projects/1/tasks/assignments', json={'assignments': [
+        {'task_id': 1, 'member_id': 1} for _ in range(MAX_ASSIGNMENTS + 1)
+    ]}, headers=headers)
+    assert response.status_code == 400
+    assert 'assignments' in response.json['errors']['json']
+
+    response = database_with_data.get('api/v1/projects/1/tasks/1', headers=headers)
+    assert response.json['members'] == []
+
+
+def test_assign_members_not_found(database_with_data, access_token_valid):
+    """
+    Given the protected endpoint /projects/<project_id>/tasks/assignments,
+    When the method is PUT and a member does not belong to the project,
+    Then the user should receive a 404 status code and no pair should be assigned.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    response = database_with_data.put('api/v1/projects/1/tasks/assignments', json={'assignments': [
+        {'task_id': 1, 'member_id': 1},
+        {'task_id': 1, 'member_id': 99},
+    ]}, headers=headers)
+    assert response.status_code == 404
+
+    response = database_with_data.get('api/v1/projects/1/tasks/1', headers=headers)
+    assert response.json['members'] == []
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+
+from src import db
+from src.cache import TokenCacheState
+from src.extensions import token_cache
+from src.models import Token, User
+
+
+def make_cache(size=2, seconds=60):
+    return TokenCacheState(size, timedelta(seconds=seconds))
+
+
+def test_cache_hit_and_miss():
+    """
+    Given a token cache,
+    When a cached and an unknown token are requested,
+    Then the hit and miss counters should be updated.
+    """
+    cache = make_cache()
+    cache.set('a', 1, datetime.now() + timedelta(minutes=5))
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.stats() == {'size': 1, 'maxsize': 2, 'hits': 1, 'misses': 1}
+
+
+def test_cache_lru_eviction():
+    """
+    Given a full token cache,
+    When a new token is added,
+    Then the least recently used token should be evicted.
+    """
+    cache = make_cache(size=2)
+    expiration = datetime.now() + timedelta(minutes=5)
+    cache.set('a', 1, expiration)
+    cache.set('b', 2, expiration)
+    cache.get('a')
+    cache.set('c', 3, expiration)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_cache_expiration():
+    """
+    Given a cached token,
+    When the token or the cache TTL expires,
+    Then the token should no longer be returned.
+    """
+    cache = make_cache(seconds=60)
+    cache.set('expired', 1, datetime.now() - timedelta(seconds=1))
+    cache.ttl = timedelta(0)
+    cache.set('ttl', 1, datetime.now() + timedelta(minutes=5))
+
+    assert cache.get('expired') is None
+    assert cache.get('ttl') is None
+    assert len(cache) == 0
+
+
+def test_cache_invalidate_user():
+    """
+    Given tokens of several users in the cache,
+    When the tokens of one user are invalidated,
+    Then only the tokens of the other users should remain.
+    """
+    cache = make_cache(size=3)
+    expiration = datetime.now() + timedelta(minutes=5)
+    cache.set('a', 1, expiration)
+    cache.set('b', 1, expiration)
+    cache.set('c', 2, expiration)
+    cache.invalidate_user(1)
+
+    assert cache.get('a') is None
+    assert cache.get('b') is None
+    assert cache.get('c') == 2
+
+
+def test_verify_access_token_cached(database_with_data, access_token_valid):
+    """
+    Given a verified access token,
+    When the token is verified again,
+    Then the user should be returned from the cache.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    database_with_data.get('api/v1/users/me', headers=headers)
+    hits = token_cache.stats()['hits']
+
+    response = database_with_data.get('api/v1/users/me', headers=headers)
+    assert response.status_code == 200
+    assert response.json['id'] == 1
+    assert token_cache.stats()['hits'] == hits + 1
+
+
+def test_expire_invalidates_cache(database_with_data, access_token_valid):
+    """
+    Given a cached access token,
+    When the token is expired,
+    Then the token should be rejected.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    database_with_data.get('api/v1/users/me', headers=headers)
+
+    token = Token.from_jwt(access_token_valid)
+    token.expire()
+    db.session.commit()
+
+    response = database_with_data.get('api/v1/users/me', headers=headers)
+    assert response.status_code == 401
+
+
+def test_revoke_all_invalidates_cache(database_with_data, access_token_valid):
+    """
+    Given a cached access token,
+    When all the tokens of the user are revoked,
+    Then the token should be rejected.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    database_with_data.get('api/v1/users/me', headers=headers)
+
+    db.session.get(User, 1).revoke_all()
+
+    response = database_with_data.get('api/v1/users/me', headers=headers)
+    assert response.status_code == 401
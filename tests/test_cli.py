@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+from src import db
+from src.models import Project, ProjectCostSummary, Token
+
+
+def test_budget_check(database_with_data):
+    """
+    Given projects with up to date budgets,
+    When the budget check command is run,
+    Then the command should succeed.
+    """
+    db.session.get(Project, 1).update_budget()
+    db.session.commit()
+
+    result = database_with_data.application.test_cli_runner().invoke(args=['budget', 'check'])
+    assert result.exit_code == 0
+    assert '0 project(s)' in result.output
+
+
+def test_budget_check_stale(database_with_data):
+    """
+    Given a project with a stale budget,
+    When the budget check command is run,
+    Then the command should report the stale totals and fail.
+    """
+    project = db.session.get(Project, 1)
+    project.update_budget()
+    project.members[0].tasks.append(project.tasks[0])
+    db.session.commit()
+
+    result = database_with_data.application.test_cli_runner().invoke(args=['budget', 'check'])
+    assert result.exit_code != 0
+    assert 'Project 1: total_cost_members is' in result.output
+    assert 'expected 6000' in result.output
+
+
+def test_budget_check_fix(database_with_data):
+    """
+    Given a project with a stale budget,
+    When the budget check command is run with --fix,
+    Then the budget of the project should be recomputed.
+    """
+    project = db.session.get(Project, 1)
+    project.update_budget()
+    project.members[0].tasks.append(project.tasks[0])
+    db.session.commit()
+
+    result = database_with_data.application.test_cli_runner().invoke(args=['budget', 'check', '--fix'])
+    assert result.exit_code == 0
+    assert db.session.get(Project, 1).budget == 13770
+
+
+def test_budget_recompute(database_with_data):
+    """
+    Given a project whose budget was never calculated,
+    When the budget recompute command is run,
+    Then the budget of the project should be calculated.
+    """
+    result = database_with_data.application.test_cli_runner().invoke(args=['budget', 'recompute'])
+    assert result.exit_code == 0
+    assert '1 project(s) recomputed' in result.output
+    assert db.session.get(Project, 1).budget == 7770
+
+
+def test_summary_rebuild(database_with_data):
+    """
+    Given a project without a stored cost summary,
+    When the summary rebuild command is run,
+    Then the cost summary of the project should be stored.
+    """
+    db.session.execute(db.delete(ProjectCostSummary))
+    db.session.commit()
+
+    result = database_with_data.application.test_cli_runner().invoke(args=['summary', 'rebuild'])
+    assert result.exit_code == 0
+    assert '1 project(s) rebuilt' in result.output
+    assert db.session.get(ProjectCostSummary, 1).license_cost == 6660
+
+
+def test_tokens_reap(database_with_data, tokens):
+    """
+    Given an expired token and a valid one,
+    When the tokens reap command is run,
+    Then only the expired token should be deleted.
+    """
+    expired = datetime.now() - timedelta(days=2)
+    db.session.add(Token(user_id=1, access_token='a', access_expiration=expired,
+                         refresh_token='r', refresh_expiration=expired))
+    db.session.commit()
+
+    result = database_with_data.application.test_cli_runner().invoke(args=['tokens', 'reap', '--batch-size', '1'])
+    assert result.exit_code == 0
+    assert '1 expired token(s) deleted' in result.output
+    assert db.session.query(Token).count() == 1
+
+
+def test_db_commands(app):
+    """
+    Given the db command group, which loads Flask-Migrate when it is used,
+    When a migration command is run,
+    Then Flask-Migrate should be initialized for the app and run it.
+    """
+    result = app.application.test_cli_runner().invoke(args=['db', '--help'])
+    assert result.exit_code == 0
+    assert 'upgrade' in result.output
+
+    result = app.application.test_cli_runner().invoke(args=['db', 'heads'])
+    assert result.exit_code == 0
+    assert 'migrate' in app.application.extensions
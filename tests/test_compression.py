@@ -0,0 +1,113 @@
+import gzip
+import json
+
+import pytest
+
+
+
+@pytest.fixture
+def compression(database_with_data):
+    """ Compress every response, whatever its size."""
+    state = database_with_data.application.extensions['compression']
+    min_size, streams = state.min_size, state.streams
+    state.min_size = 0
+    yield state
+    state.min_size, state.streams = min_size, streams
+    state.clear()
+
+
+def test_gzip_response(database_with_data, access_token_valid, compression):
+    """
+    Given a client that accepts gzip,
+    When a collection is requested,
+    Then the response should be compressed with gzip.
+    """
+    response = database_with_data.get('api/v1/projects/1/products', headers={
+        'Authorization': f'Bearer {access_token_valid}', 'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(json.loads(gzip.decompress(response.data))) == 6
+
+
+def test_identity_response(database_with_data, access_token_valid, compression):
+    """
+    Given a client that does not send Accept-Encoding,
+    When a collection is requested,
+    Then the response should not be compressed.
+    """
+    response = database_with_data.get('api/v1/projects/1/products', headers={
+        'Authorization': f'Bearer {access_token_valid}'})
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert len(response.json) == 6
+
+
+def test_small_response(database_with_data, access_token_valid, compression):
+    """
+    Given a response smaller than COMPRESS_MIN_SIZE,
+    When it is requested by a client that accepts gzip,
+    Then the response should not be compressed.
+    """
+    compression.min_size = 10000
+    response = database_with_data.get('api/v1/projects/1/products', headers={
+        'Authorization': f'Bearer {access_token_valid}', 'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_stream_response(database_with_data, access_token_valid, compression):
+    """
+    Given a streamed collection,
+    When it is requested by a client that accepts gzip,
+    Then the streamed chunks should be compressed.
+    """
+    response = database_with_data.get('api/v1/projects/1/products?stream=1', headers={
+        'Authorization': f'Bearer {access_token_valid}', 'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    assert len(json.loads(gzip.decompress(response.data))) == 6
+
+    compression.streams = False
+    response = database_with_data.get('api/v1/projects/1/products?stream=1', headers={
+        'Authorization': f'Bearer {access_token_valid}', 'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_cached_by_etag(database_with_data, access_token_valid, compression):
+    """
+    Given a compressed response with an ETag,
+    When the same resource is requested again,
+    Then the compressed body should come from the cache and the ETag name the encoding.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}', 'Accept-Encoding': 'gzip'}
+    response = database_with_data.get('api/v1/projects/1', headers=headers)
+    assert response.status_code == 200
+    etag, weak = response.get_etag()
+    assert etag.endswith('-gzip') and not weak
+    assert len(compression._entries) == 1
+
+    cached = database_with_data.get('api/v1/projects/1', headers=headers)
+    assert cached.data == response.data
+    assert cached.headers['ETag'] == response.headers['ETag']
+    assert len(compression._entries) == 1
+
+
+def test_conditional_get(database_with_data, access_token_valid, compression):
+    """
+    Given the ETags of the compressed and uncompressed representations of a resource,
+    When the resource is requested again with If-None-Match and Accept-Encoding: gzip,
+    Then the user should receive a 304 status code with the ETag that matched.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    identity = database_with_data.get('api/v1/projects/1', headers=headers)
+    compressed = database_with_data.get('api/v1/projects/1', headers={**headers, 'Accept-Encoding': 'gzip'})
+    assert compressed.headers['ETag'] == identity.headers['ETag'][:-1] + '-gzip"'
+
+    for etag in (compressed.headers['ETag'], identity.headers['ETag']):
+        response = database_with_data.get('api/v1/projects/1', headers={
+            **headers, 'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert 'Accept-Encoding' in response.headers['Vary']
@@ -1,7 +1,12 @@
-from datetime import date, timedelta
+import os
+from datetime import date, datetime, timedelta
 
-from src import db
-from src.models import User, Project, Member, Task, Product, ProductType
+import pytest
+from flask_migrate import upgrade, downgrade
+
+from src import create_app, db
+from src.extensions import migrate
+from src.models import User, Project, Member, Task, Product, ProductType, Token, task_member
 
 
 def test_empty_database(app_database):
@@ -154,4 +159,82 @@ def test_product_data(database_with_data):
     assert other_license.cost == 10
     assert other_license.amount == 1
     assert other_license.project.id == 1
-    
\ No newline at end of file
+    
+
+hot_queries = [
+    db.select(Token).where(Token.access_token == 'token'),
+    db.select(Token).where(Token.refresh_token == 'token'),
+    db.select(Token.id).where(Token.refresh_expiration < datetime(2024, 1, 1)),
+    db.select(Token).where(Token.user_id == 1),
+    db.select(Project).where(Project.user_id == 1),
+    db.select(Member).where(Member.project_id == 1),
+    db.select(Task).where(Task.project_id == 1),
+    db.select(Product).where(Product.project_id == 1),
+    db.select(db.func.sum(Product.cost * Product.amount)).where(Product.project_id == 1, Product.license == 1),
+    db.select(task_member).where(task_member.c.member_id == 1),
+]
+
+
+@pytest.mark.parametrize('query', hot_queries)
+def test_hot_queries_use_index(app_database, query):
+    """
+    Given a query issued on a hot path,
+    When SQLite plans the query,
+    Then the query should search an index instead of scanning the table.
+    """
+    compiled = query.compile(dialect=db.engine.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    plan = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params).all()
+
+    details = ' '.join(row[-1] for row in plan)
+    assert 'USING' in details and 'INDEX' in details, details
+    assert 'SCAN' not in details, details
+
+
+def test_migrations_upgrade_and_downgrade(tmp_path):
+    """
+    Given an empty database,
+    When the migrations are applied and then reverted,
+    Then the indexes, columns and tables should be created and dropped again.
+    """
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "migrations.db"}'})
+    directory = os.path.join(os.path.dirname(__file__), '..', 'migrations')
+
+    migrate.load(app)
+
+    with app.app_context():
+        upgrade(directory=directory)
+        assert 'ix_token_access_token' in index_names('token')
+        assert 'ix_product_project_id_license' in index_names('product')
+
+        assert 'token_version' in column_names('user')
+        assert 'version' in column_names('project')
+        assert 'project_cost_summary' in db.inspect(db.engine).get_table_names()
+        assert 'costs_computed_on' in column_names('project')
+
+        downgrade(directory=directory, revision='39ae370d3340')
+        assert 'costs_computed_on' not in column_names('project')
+
+        downgrade(directory=directory, revision='1622659eda9a')
+        assert 'project_cost_summary' not in db.inspect(db.engine).get_table_names()
+
+        downgrade(directory=directory, revision='f1d5c36036f6')
+        assert 'version' not in column_names('project')
+
+        downgrade(directory=directory, revision='6453e619e079')
+        assert 'token_version' not in column_names('user')
+
+        downgrade(directory=directory, revision='5228113e0f42')
+        assert 'ix_token_access_token' not in index_names('token')
+        assert 'token' in db.inspect(db.engine).get_table_names()
+
+        downgrade(directory=directory, revision='base')
+        assert 'token' not in db.inspect(db.engine).get_table_names()
+
+
+def index_names(table):
+    return {index['name'] for index in db.inspect(db.engine).get_indexes(table)}
+
+
+def column_names(table):
+    return {column['name'] for column in db.inspect(db.engine).get_columns(table)}
@@ -0,0 +1,220 @@
+import json
+
+from src import db
+from src.models import Project
+
+
+def test_paginated_response_first_page(database_with_data, access_token_valid):
+    """
+    Given a paginated endpoint with more items than the page size,
+    When the first page is requested,
+    Then the user should receive the first items and a link to the next page.
+    """
+    response = database_with_data.get('api/v1/projects/1/products?limit=4', headers={
+        'Authorization': f'Bearer {access_token_valid}'})
+    assert response.status_code == 200
+    assert [product['id'] for product in response.json] == [1, 2, 3, 4]
+    assert response.headers['Link'] == '</api/v1/projects/1/products?limit=4&after=4>; rel="next"'
+
+
+def test_paginated_response_next_page(database_with_data, access_token_valid):
+    """
+    Given a paginated endpoint,
+    When the last page is requested with the after parameter,
+    Then the user should receive the remaining items and no link to a next page.
+    """
+    response = database_with_data.get('api/v1/projects/1/products?limit=4&after=4', headers={
+        'Authorization': f'Bearer {access_token_valid}'})
+    assert response.status_code == 200
+    assert [product['id'] for product in response.json] == [5, 6]
+    assert 'Link' not in response.headers
+
+
+def test_paginated_response_max_page_size(database_with_data, access_token_valid):
+    """
+    Given a paginated endpoint,
+    When a page larger than the maximum page size is requested,
+    Then the page should be limited to the maximum page size.
+    """
+    app = database_with_data.application
+    max_page_size = app.config['PAGE_SIZE_MAX']
+    app.config['PAGE_SIZE_MAX'] = 2
+    try:
+        response = database_with_data.get('api/v1/projects/1/products?limit=50', headers={
+            'Authorization': f'Bearer {access_token_valid}'})
+    finally:
+        app.config['PAGE_SIZE_MAX'] = max_page_size
+    assert response.status_code == 200
+    assert len(response.json) == 2
+    assert 'limit=2&after=2' in response.headers['Link']
+
+
+def test_paginated_response_invalid_limit(database_with_data, access_token_valid):
+    """
+    Given a paginated endpoint,
+    When an invalid page size is requested,
+    Then the user should receive a 400 status code.
+    """
+    response = database_with_data.get('api/v1/users?limit=0', headers={
+        'Authorization': f'Bearer {access_token_valid}'})
+    assert response.status_code == 400
+
+
+def test_paginated_response_docs(app):
+    """
+    Given a paginated endpoint,
+    When the API documentation is generated,
+    Then the pagination parameters and the Link header should be documented.
+    """
+    response = app.get('/apispec.json')
+    operation = response.json['paths']['/api/v1/users']['get']
+    assert {parameter['name'] for parameter in operation['parameters']} == {'limit', 'after', 'stream'}
+    assert 'Link' in operation['responses']['200']['headers']
+
+
+def test_stream_response(database_with_data, access_token_valid):
+    """
+    Given a paginated endpoint,
+    When the collection is requested with stream=1,
+    Then the user should receive the whole collection as a streamed JSON array.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    response = database_with_data.get('api/v1/projects/1/products?stream=1&limit=100', headers=headers)
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == 'application/json'
+
+    page = database_with_data.get('api/v1/projects/1/products?limit=100', headers=headers)
+    assert response.json == page.json
+
+
+def test_stream_response_after(database_with_data, access_token_valid):
+    """
+    Given a paginated endpoint,
+    When the collection is streamed with the after parameter,
+    Then only the items after the given id should be streamed.
+    """
+    response = database_with_data.get('api/v1/projects/1/products?stream=1&after=4', headers={
+        'Authorization': f'Bearer {access_token_valid}'})
+    assert [product['id'] for product in response.json] == [5, 6]
+
+
+def test_stream_response_ndjson(database_with_data, access_token_valid):
+    """
+    Given a paginated endpoint,
+    When the collection is requested accepting application/x-ndjson,
+    Then the user should receive one JSON document per line.
+    """
+    response = database_with_data.get('api/v1/projects/1/members', headers={
+        'Authorization': f'Bearer {access_token_valid}', 'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)['name_member'] for line in lines] == ['test_member', 'test_member2']
+
+
+def test_stream_response_empty(database_with_data, access_token_valid):
+    """
+    Given a paginated endpoint with no items after the given id,
+    When the collection is streamed,
+    Then the user should receive an empty JSON array.
+    """
+    response = database_with_data.get('api/v1/projects/1/tasks?stream=1&after=10', headers={
+        'Authorization': f'Bearer {access_token_valid}'})
+    assert response.status_code == 200
+    assert response.json == []
+
+
+def test_project_etag_not_modified(database_with_data, access_token_valid):
+    """
+    Given a project resource that was read with its ETag,
+    When it is requested again with If-None-Match and nothing changed,
+    Then the user should receive a 304 status code with the same ETag.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    response = database_with_data.get('api/v1/projects/1/products_by_type', headers=headers)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    response = database_with_data.get('api/v1/projects/1/products_by_type',
+                                      headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.data == b''
+
+
+def test_project_etag_per_page(database_with_data, access_token_valid):
+    """
+    Given the ETag of the first page of a project collection,
+    When another page or the same page with an invalid limit is requested with it,
+    Then the user should receive the page or a 400 status code instead of a 304.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    response = database_with_data.get('api/v1/projects/1/products?limit=2', headers=headers)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    response = database_with_data.get('api/v1/projects/1/products?limit=2',
+                                      headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+
+    response = database_with_data.get('api/v1/projects/1/products?limit=2&after=2',
+                                      headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert [product['id'] for product in response.json] == [3, 4]
+
+    response = database_with_data.get('api/v1/projects/1/products?limit=abc',
+                                      headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 400
+
+
+def test_project_etag_changes_on_write(database_with_data, access_token_valid):
+    """
+    Given the ETag of a project,
+    When a member of the project is updated,
+    Then the project should no longer match the ETag.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    etag = database_with_data.get('api/v1/projects/1', headers=headers).headers['ETag']
+
+    response = database_with_data.put('api/v1/projects/1/members/1', json={'salary': 2000}, headers=headers)
+    assert response.status_code == 200
+
+    response = database_with_data.get('api/v1/projects/1', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_project_etag_changes_on_assignment(database_with_data, access_token_valid):
+    """
+    Given the ETag of the members costs of a project,
+    When members are assigned to tasks in bulk,
+    Then the costs should no longer match the ETag.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    etag = database_with_data.get('api/v1/projects/1/members_costs', headers=headers).headers['ETag']
+
+    response = database_with_data.put('api/v1/projects/1/tasks/assignments', headers=headers, json={
+        'assignments': [{'task_id': 1, 'member_id': 1}, {'task_id': 1, 'member_id': 2}]})
+    assert response.status_code == 200
+
+    response = database_with_data.get('api/v1/projects/1/members_costs', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_project_etag_other_user(database_with_data, access_token_valid):
+    """
+    Given a project of another user,
+    When it is requested with If-None-Match,
+    Then the user should receive a 401 status code and no ETag.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    project = db.session.get(Project, 1)
+    project.user_id = 2
+    db.session.commit()
+
+    response = database_with_data.get('api/v1/projects/1', headers={**headers, 'If-None-Match': '*'})
+    assert response.status_code == 401
+    assert 'ETag' not in response.headers
@@ -0,0 +1,190 @@
+import socketserver
+import threading
+import time
+
+import pytest
+from flask_mail import Message
+
+from src.extensions import mail, mail_queue
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply('220 localhost ESMTP')
+        while line := self.rfile.readline():
+            command = line.decode().strip().split(' ')[0].upper()
+            if command == 'DATA':
+                if server.fail_next > 0:
+                    server.fail_next -= 1
+                    self.reply('451 try again later')
+                    continue
+                self.reply('354 end data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                time.sleep(server.delay)
+                server.messages += 1
+                self.reply('250 ok')
+            elif command == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeSMTPHandler)
+        self.connections = 0
+        self.messages = 0
+        self.fail_next = 0
+        self.delay = 0
+
+
+@pytest.fixture
+def smtp_server(app):
+    """ Point the mail extension and the mail queue at a local fake SMTP server."""
+    server = FakeSMTPServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    application = app.application
+    config = {
+        'MAIL_SERVER': '127.0.0.1',
+        'MAIL_PORT': server.server_address[1],
+        'MAIL_USE_TLS': False,
+        'MAIL_USERNAME': '',
+        'MAIL_PASSWORD': '',
+        'MAIL_SUPPRESS_SEND': False,
+        'MAIL_QUEUE_WORKERS': 1,
+        'MAIL_QUEUE_BATCH_SIZE': 20,
+        'MAIL_QUEUE_RETRIES': 2,
+        'MAIL_QUEUE_BACKOFF': 0.01,
+        'MAIL_QUEUE_IDLE_SECONDS': 5,
+    }
+    previous = {key: application.config.get(key) for key in config}
+    application.config.update(config)
+    mail.init_app(application)
+    mail_queue.init_app(application, mail)
+
+    yield server
+
+    mail_queue.join()
+    application.config.update(previous)
+    mail.init_app(application)
+    mail_queue.init_app(application, mail)
+    server.shutdown()
+    server.server_close()
+
+
+def message(i=0):
+    return Message('Reset Password', recipients=[f'user{i}@test.com'], body='test')
+
+
+def test_request_reset_is_queued(database_with_data, smtp_server):
+    """
+    Given a slow mail server,
+    When a password reset is requested,
+    Then the response should not wait for the email to be delivered.
+    """
+    smtp_server.delay = 0.5
+    start = time.perf_counter()
+    response = database_with_data.post('api/v1/tokens/reset', json={'email': 'test@test.com'})
+    elapsed = time.perf_counter() - start
+
+    assert response.status_code == 204
+    assert elapsed < 0.5
+    mail_queue.join()
+    assert smtp_server.messages == 1
+
+
+def test_connection_reused(app, smtp_server):
+    """
+    Given several queued emails,
+    When the queue delivers them,
+    Then they should be sent over a single SMTP connection.
+    """
+    sent = mail_queue.stats()['sent']
+    for i in range(5):
+        mail_queue.enqueue(message(i))
+    mail_queue.join()
+
+    assert smtp_server.messages == 5
+    assert smtp_server.connections == 1
+    assert mail_queue.stats()['sent'] - sent == 5
+    assert mail_queue.depth() == 0
+
+
+def test_retry_with_backoff(app, smtp_server):
+    """
+    Given a mail server that rejects the first attempt,
+    When an email is queued,
+    Then it should be retried and delivered.
+    """
+    smtp_server.fail_next = 1
+    retried = mail_queue.stats()['retried']
+    mail_queue.enqueue(message())
+    mail_queue.join()
+
+    assert smtp_server.messages == 1
+    assert mail_queue.stats()['retried'] - retried == 1
+
+
+def test_callback_error_not_retried(app, smtp_server):
+    """
+    Given an on_send callback that raises,
+    When an email is queued,
+    Then the email should be sent once and not retried.
+    """
+    def callback(duration):
+        raise RuntimeError('callback failed')
+
+    retried = mail_queue.stats()['retried']
+    mail_queue.on_send.append(callback)
+    try:
+        mail_queue.enqueue(message())
+        mail_queue.join()
+    finally:
+        mail_queue.on_send.remove(callback)
+
+    assert smtp_server.messages == 1
+    assert mail_queue.stats()['retried'] == retried
+    assert mail_queue.depth() == 0
+
+
+def test_give_up_after_retries(app, smtp_server):
+    """
+    Given a mail server that keeps rejecting an email,
+    When the retries are exhausted,
+    Then the email should be counted as failed.
+    """
+    smtp_server.fail_next = 3
+    failed = mail_queue.stats()['failed']
+    mail_queue.enqueue(message())
+    mail_queue.join()
+
+    assert smtp_server.messages == 0
+    assert mail_queue.stats()['failed'] - failed == 1
+
+
+def test_queue_depth(app, smtp_server):
+    """
+    Given a slow mail server,
+    When emails are queued faster than they are sent,
+    Then the queue depth should report the pending emails.
+    """
+    smtp_server.delay = 0.1
+    for i in range(3):
+        mail_queue.enqueue(message(i))
+
+    assert mail_queue.depth() > 0
+    assert mail_queue.stats()['depth'] == mail_queue.depth()
+    mail_queue.join()
+    assert mail_queue.depth() == 0
@@ -0,0 +1,94 @@
+import pytest
+
+from src import create_app, db
+from src.extensions import password_hasher
+from src.hashing import PasswordHasherState
+from src.models import User
+
+
+@pytest.fixture
+def hash_method(app):
+    config = app.application.config
+    previous = config['PASSWORD_HASH_METHOD']
+
+    def set_method(method):
+        config['PASSWORD_HASH_METHOD'] = method
+        password_hasher.init_app(app.application)
+
+    yield set_method
+    set_method(previous)
+
+
+def test_hash_in_process_pool():
+    """
+    Given a password hasher with a process pool,
+    When a password is hashed and verified,
+    Then the hash should use the configured method and check the password.
+    """
+    hasher = PasswordHasherState('pbkdf2:sha256:1000', workers=1)
+    try:
+        password_hash = hasher.hash('test')
+        assert password_hash.startswith('pbkdf2:sha256:1000$')
+        assert hasher.verify(password_hash, 'test')
+        assert not hasher.verify(password_hash, 'wrong')
+    finally:
+        hasher.close()
+
+
+def test_needs_rehash():
+    """
+    Given a password hasher,
+    When hashes made with different methods are checked,
+    Then only the ones that differ from the configured method need a rehash.
+    """
+    hasher = PasswordHasherState('pbkdf2')
+    default_hash = hasher.hash('test')
+
+    assert not hasher.needs_rehash(default_hash)
+    hasher = PasswordHasherState('pbkdf2:sha256:1000')
+    assert hasher.needs_rehash(default_hash)
+    assert not hasher.needs_rehash(hasher.hash('test'))
+
+
+def test_hash_method_per_app(app):
+    """
+    Given a second app configured with another hash method,
+    When passwords are hashed in each app,
+    Then each app should keep using its own method.
+    """
+    other = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+                        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:2000', 'PASSWORD_HASH_WORKERS': 0,
+                        'TOKEN_REAPER_INTERVAL': 0})
+
+    with other.app_context():
+        assert password_hasher.hash('test').startswith('pbkdf2:sha256:2000$')
+    assert password_hasher.hash('test').startswith('pbkdf2:sha256:1000$')
+
+
+def test_rehash_on_login(database_with_data, hash_method):
+    """
+    Given a user whose password was hashed with an older method,
+    When the user logs in,
+    Then the password should be hashed again with the new method.
+    """
+    hash_method('pbkdf2:sha256:2000')
+
+    response = database_with_data.post('api/v1/tokens', auth=('test1', 'test1'))
+    assert response.status_code == 200
+    user = db.session.get(User, 1)
+    assert user.password_hash.startswith('pbkdf2:sha256:2000$')
+    assert user.verify_password('test1')
+
+
+def test_no_rehash_on_failed_login(database_with_data, hash_method):
+    """
+    Given a user whose password was hashed with an older method,
+    When a login fails,
+    Then the stored hash should not change.
+    """
+    password_hash = db.session.get(User, 1).password_hash
+    hash_method('pbkdf2:sha256:2000')
+
+    response = database_with_data.post('api/v1/tokens', auth=('test1', 'wrong'))
+    assert response.status_code == 401
+    assert db.session.get(User, 1).password_hash == password_hash
@@ -0,0 +1,120 @@
+import logging
+
+import pytest
+
+from src import db
+from src.instrumentation import TooManyStatements
+from src.models import Member, Task, Product
+
+
+@pytest.fixture
+def max_statements(app):
+    config = app.application.config
+    previous = config['SQL_MAX_STATEMENTS']
+    yield lambda value: config.__setitem__('SQL_MAX_STATEMENTS', value)
+    config['SQL_MAX_STATEMENTS'] = previous
+
+
+def test_too_many_statements(database_with_data, access_token_valid, max_statements):
+    """
+    Given a limit of SQL statements per request,
+    When a request issues more statements than the limit,
+    Then the request should fail.
+    """
+    max_statements(1)
+    with pytest.raises(TooManyStatements):
+        database_with_data.get('api/v1/projects/1', headers={'Authorization': f'Bearer {access_token_valid}'})
+
+
+def test_nested_serialization_statements(database_with_data, access_token_valid, max_statements):
+    """
+    Given a project with many members, tasks and products,
+    When the projects are listed,
+    Then the number of SQL statements should not grow with the number of rows.
+    """
+    headers = {'Authorization': f'Bearer {access_token_valid}'}
+    for i in range(10):
+        db.session.add_all([
+            Member(name_member=f'member{i}', role='test_role', salary=10, project_id=1),
+            Task(name_task=f'task{i}', project_id=1),
+            Product(name_product=f'product{i}', cost=1, amount=1, license=False, type='OTHER', project_id=1),
+        ])
+    db.session.commit()
+    database_with_data.get('api/v1/users/me', headers=headers)
+
+    max_statements(6)
+    response = database_with_data.get('api/v1/projects', headers=headers)
+    assert response.status_code == 200
+    assert len(response.json[0]['members']) == 12
+
+    response = database_with_data.get('api/v1/projects/1/tasks?stream=1', headers=headers)
+    assert response.status_code == 200
+    assert len(response.json) == 11
+
+
+@pytest.fixture
+def config(app):
+    config = app.application.config
+    previous = dict(config)
+    yield config
+    config.clear()
+    config.update(previous)
+
+
+def test_server_timing(database_with_data, access_token_valid, config):
+    """
+    Given the Server-Timing header is enabled,
+    When a request is made,
+    Then the response should report the SQL statements and the time spent.
+    """
+    config['SERVER_TIMING'] = True
+    response = database_with_data.get('api/v1/projects/1', headers={'Authorization': f'Bearer {access_token_valid}'})
+
+    timings = response.headers.getlist('Server-Timing')
+    assert len(timings) == 2
+    assert timings[0].startswith('db;dur=')
+    assert 'statements"' in timings[0]
+    assert timings[1].startswith('app;dur=')
+
+
+def test_server_timing_disabled(database_with_data, config):
+    """
+    Given the Server-Timing header is disabled,
+    When a request is made,
+    Then the response should not include it.
+    """
+    config['SERVER_TIMING'] = False
+    response = database_with_data.get('api/v1/projects/1')
+    assert 'Server-Timing' not in response.headers
+
+
+def test_request_log(database_with_data, access_token_valid, caplog):
+    """
+    Given a request,
+    When it is handled,
+    Then a log record should carry the statement count and timings.
+    """
+    with caplog.at_level(logging.INFO, logger='src.instrumentation'):
+        database_with_data.get('api/v1/projects/1', headers={'Authorization': f'Bearer {access_token_valid}'})
+
+    record = caplog.records[-1]
+    assert record.levelno == logging.INFO
+    assert record.endpoint == 'projects.get_project'
+    assert record.status == 200
+    assert record.sql_statements > 0
+    assert record.sql_ms >= 0
+    assert 'sql_statements=' in record.getMessage()
+
+
+def test_slow_request_warning(database_with_data, access_token_valid, config, caplog):
+    """
+    Given a threshold of SQL statements per request,
+    When a request issues more statements than the threshold,
+    Then the request should be logged as a warning.
+    """
+    config['SQL_WARN_STATEMENTS'] = 1
+    with caplog.at_level(logging.INFO, logger='src.instrumentation'):
+        database_with_data.get('api/v1/projects/1', headers={'Authorization': f'Bearer {access_token_valid}'})
+
+    assert caplog.records[-1].levelno == logging.WARNING
+    assert caplog.records[-1].getMessage().startswith('slow request')
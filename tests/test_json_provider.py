@@ -0,0 +1,84 @@
+import datetime
+import decimal
+import enum
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+from src import create_app
+from src.json_provider import OrjsonProvider
+
+
+class Color(enum.Enum):
+    RED = 'red'
+
+
+def test_orjson_provider(app):
+    """
+    Given the app configured with the orjson provider,
+    When Decimal, date, datetime and Enum values are serialized,
+    Then they should be written as strings, ISO 8601 dates and enum values with sorted keys.
+    """
+    provider = app.application.json
+    assert isinstance(provider, OrjsonProvider)
+    data = provider.dumps({
+        'total': decimal.Decimal('10.50'),
+        'deadline': datetime.date(2026, 1, 31),
+        'created': datetime.datetime(2026, 1, 31, 12, 30),
+        'color': Color.RED,
+        'a': None,
+    })
+    assert data == ('{"a":null,"color":"red","created":"2026-01-31T12:30:00",'
+                    '"deadline":"2026-01-31","total":"10.50"}')
+
+
+def test_orjson_provider_fallback(app):
+    """
+    Given the orjson provider,
+    When a value orjson cannot encode or json.dumps arguments are given,
+    Then the stdlib encoder should serialize them with the same conversions.
+    """
+    provider = app.application.json
+    assert provider.dumps({'big': 2 ** 70, 'total': decimal.Decimal('1')}) == f'{{"big": {2 ** 70}, "total": "1"}}'
+    assert provider.dumps({'day': datetime.date(2026, 1, 31)}, indent=2) == '{\n  "day": "2026-01-31"\n}'
+
+
+def test_orjson_provider_response(app):
+    """
+    Given the orjson provider,
+    When a response is built and read back,
+    Then the body should be compact JSON ending with a newline, as with the default provider.
+    """
+    provider = app.application.json
+    response = provider.response({'b': 1, 'a': [decimal.Decimal('2.5')]})
+    assert response.mimetype == 'application/json'
+    assert response.get_data() == b'{"a":["2.5"],"b":1}\n'
+    assert provider.loads(response.get_data()) == {'a': ['2.5'], 'b': 1}
+
+
+def test_invalid_json_body(database_with_data, access_token_valid):
+    """
+    Given the orjson provider,
+    When a request is sent with a body that is not valid JSON,
+    Then the user should receive a 400 status code.
+    """
+    response = database_with_data.post('api/v1/projects', data='{"name_project": ', headers={
+        'Authorization': f'Bearer {access_token_valid}', 'Content-Type': 'application/json'})
+    assert response.status_code == 400
+
+
+def test_default_provider(tmp_path):
+    """
+    Given JSON_PROVIDER set to default,
+    When the app is created,
+    Then the stdlib provider of Flask should be used.
+    """
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "json.db"}',
+        'JSON_PROVIDER': 'default',
+        'PASSWORD_HASH_WORKERS': 0,
+        'TOKEN_REAPER_INTERVAL': 0,
+    })
+    assert type(app.json) is DefaultJSONProvider
+    assert json.loads(app.json.dumps({'total': decimal.Decimal('1')})) == {'total': '1'}
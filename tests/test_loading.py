@@ -0,0 +1,41 @@
+from src.loading import eager_load
+from src.models import Project
+from src.schemas import ProjectSchema, MemberSchema, AllUsersSchema
+
+
+def loaded_relationships(options):
+    return {(load.path[1].key, dict(load.strategy)['lazy']) for option in options for load in option.context}
+
+
+def test_eager_load_project(app):
+    """
+    Given the project schema,
+    When the loader options for the schema are requested,
+    Then the nested collections should be selectin loaded and the owner joined.
+    """
+    assert loaded_relationships(eager_load(ProjectSchema())) == {
+        ('owner', 'joined'),
+        ('members', 'selectin'),
+        ('products', 'selectin'),
+        ('tasks', 'selectin'),
+    }
+
+
+def test_eager_load_only(app):
+    """
+    Given a schema restricted with only,
+    When the loader options for the schema are requested,
+    Then only the nested fields that are dumped should be loaded.
+    """
+    assert loaded_relationships(eager_load(MemberSchema(only=['id', 'tasks']))) == {('tasks', 'selectin')}
+    assert eager_load(AllUsersSchema()) == ()
+
+
+def test_eager_load_model(app):
+    """
+    Given a schema and an explicit model,
+    When the loader options for the schema are requested,
+    Then the options should apply to the given model.
+    """
+    options = eager_load(ProjectSchema(only=['id', 'owner']), Project)
+    assert loaded_relationships(options) == {('owner', 'joined')}
@@ -0,0 +1,55 @@
+from flask_mail import Message
+
+from src.extensions import mail_queue, metrics
+
+
+def sample(name, **labels):
+    return metrics.registry.get_sample_value(name, labels)
+
+
+def budget_updates():
+    return sum(sample('budget_update_duration_seconds_count', mode=mode) or 0 for mode in ('full', 'delta'))
+
+
+def test_metrics_endpoint(database_with_data, access_token_valid):
+    """
+    Given requests to the API,
+    When the /metrics endpoint is requested,
+    Then it should report the request latencies per endpoint in the Prometheus format.
+    """
+    labels = {'method': 'GET', 'endpoint': 'projects.get_project', 'status': '200'}
+    before = sample('http_request_duration_seconds_count', **labels) or 0
+    database_with_data.get('api/v1/projects/1', headers={'Authorization': f'Bearer {access_token_valid}'})
+
+    response = database_with_data.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    assert 'http_request_duration_seconds_bucket{' in response.text
+    assert 'token_cache_hit_ratio' in response.text
+    assert 'email_queue_depth' in response.text
+    assert sample('http_request_duration_seconds_count', **labels) == before + 1
+
+
+def test_budget_update_duration(database_with_data, access_token_valid):
+    """
+    Given a member added to a project,
+    When the budget of the project is updated,
+    Then the budget update duration should be recorded.
+    """
+    before = budget_updates()
+    response = database_with_data.post('api/v1/projects/1/members', json={
+        'name_member': 'new_member', 'role': 'test_role', 'salary': 100,
+    }, headers={'Authorization': f'Bearer {access_token_valid}'})
+    assert response.status_code == 201
+    assert budget_updates() == before + 1
+
+
+def test_email_send_duration(app):
+    """
+    Given the mail queue,
+    When an email is sent,
+    Then the send latency should be recorded.
+    """
+    before = sample('email_send_duration_seconds_count')
+    mail_queue.enqueue(Message('test', recipients=['test@test.com'], body='test'))
+    assert sample('email_send_duration_seconds_count') == before + 1
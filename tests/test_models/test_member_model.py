@@ -1,3 +1,5 @@
+from datetime import date, timedelta
+
 from src import db
 from src.models import Member, Task, Project
 
@@ -117,3 +119,34 @@ def test_calc_costs_for_all_members(database_with_data):
     ]
 
     assert Member.calc_costs_for_all_members(project.id) == cost_for_all_member
+
+
+def test_calc_total_cost_latest_task(database_with_data):
+    """
+    Given a member with several tasks,
+    When I call the calc_total_cost method of the member object,
+    Then only the months of the task with the latest deadline should be counted.
+    """
+    project = db.session.get(Project, 1)
+    member = db.session.get(Member, 1)
+    short_task = Task(name_task='short_task', deadline=date.today() + timedelta(days=31 * 2), project=project)
+    past_task = Task(name_task='past_task', deadline=date.today() - timedelta(days=1),
+                     created_at=date.today() - timedelta(days=31 * 12), project=project)
+    db.session.add_all([short_task, past_task])
+    member.assign_task(short_task)
+    member.assign_task(past_task)
+    member.assign_task(db.session.get(Task, 1))
+
+    assert member.calc_total_cost() == 6000
+
+
+def test_calc_costs_for_all_members_without_tasks(database_with_data):
+    """
+    Given a project whose members have no tasks,
+    When I call the calc_cost_for_all_members method of the Member class,
+    Then the total cost of every member should be zero.
+    """
+    assert Member.calc_costs_for_all_members(1) == [
+        {'member': 'test_member', 'total_cost': 0},
+        {'member': 'test_member2', 'total_cost': 0},
+    ]
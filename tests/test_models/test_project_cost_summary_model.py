@@ -0,0 +1,159 @@
+from datetime import date, timedelta
+
+from src import db
+from src.models import Project, ProjectCostSummary, Product, Member
+
+
+def test_summary_created_on_commit(database_with_data):
+    """
+    Given a project whose rows were committed,
+    When the cost summary of the project is requested,
+    Then the stored summary should hold the cost reports of the project.
+    """
+    summary = db.session.get(ProjectCostSummary, 1)
+    assert summary is not None
+    assert summary.computed_on == date.today()
+    assert summary.costs_by_license() == {'no_license_cost': 1110, 'license_cost': 6660}
+    assert summary.costs_by_type == {'HARDWARE': 7000, 'SOFTWARE': 700, 'OTHER': 70}
+    assert summary.members == [
+        {'member': 'test_member', 'total_cost': 0},
+        {'member': 'test_member2', 'total_cost': 0},
+    ]
+
+
+def test_summary_updated_on_assignment(database_with_data):
+    """
+    Given a project with a stored cost summary,
+    When a task is assigned to a member and the session commits,
+    Then the member costs of the summary should be updated.
+    """
+    project = db.session.get(Project, 1)
+    project.members[0].assign_task(project.tasks[0])
+    db.session.commit()
+
+    summary = db.session.get(ProjectCostSummary, 1)
+    assert summary.members[0] == {'member': 'test_member', 'total_cost': 6000}
+
+
+def test_summary_updated_on_product_delete(database_with_data):
+    """
+    Given a project with a stored cost summary,
+    When a product is deleted and the session commits,
+    Then the product costs of the summary should be updated.
+    """
+    db.session.delete(db.session.get(Product, 2))
+    db.session.commit()
+
+    summary = db.session.get(ProjectCostSummary, 1)
+    assert summary.license_cost == 660
+    assert summary.costs_by_type['HARDWARE'] == 1000
+
+
+def test_summary_not_updated_on_rollback(database_with_data):
+    """
+    Given a project with a stored cost summary,
+    When a change to a member is rolled back,
+    Then the summary should not be rebuilt.
+    """
+    member = db.session.get(Member, 1)
+    member.salary = 5000
+    db.session.flush()
+    db.session.rollback()
+
+    assert 'cost_summary_changes' not in db.session.info
+
+
+def test_summary_delta_matches_rebuild(database_with_data):
+    """
+    Given a project with a stored cost summary,
+    When products are added, updated and deleted and the session commits,
+    Then the summary should hold the same costs as a full recomputation.
+    """
+    project = db.session.get(Project, 1)
+    db.session.add(Product(name_product='delta_product', cost=3, amount=4, license=True, type='SOFTWARE',
+                           project=project))
+    product = db.session.get(Product, 1)
+    product.cost = 500
+    product.license = True
+    db.session.get(Product, 3).type = 'OTHER'
+    db.session.delete(db.session.get(Product, 6))
+    db.session.commit()
+
+    summary = db.session.get(ProjectCostSummary, 1)
+    expected = ProjectCostSummary.calc(1)
+    assert summary.license_cost == expected['license_cost']
+    assert summary.no_license_cost == expected['no_license_cost']
+    assert summary.costs_by_type == expected['costs_by_type']
+
+
+def test_summary_rebuilt_on_project_dates(database_with_data):
+    """
+    Given a project with a stored cost summary,
+    When the deadline of the project changes and the session commits,
+    Then the license costs of the summary should follow the new duration.
+    """
+    project = db.session.get(Project, 1)
+    project.deadline = project.deadline + timedelta(days=62)
+    db.session.commit()
+
+    assert db.session.get(ProjectCostSummary, 1).license_cost == ProjectCostSummary.calc(1)['license_cost']
+
+
+def test_mark_changed(database_with_data):
+    """
+    Given products inserted without the ORM unit of work,
+    When their rows are recorded as changes and the session commits,
+    Then the summary should include the new products.
+    """
+    rows = [{'name_product': 'bulk_product', 'cost': 5, 'amount': 2, 'license': False, 'type': 'OTHER'}]
+    db.session.execute(db.insert(Product), [dict(row, project_id=1) for row in rows])
+    ProjectCostSummary.mark_changed(1, products=rows)
+    db.session.commit()
+
+    summary = db.session.get(ProjectCostSummary, 1)
+    assert summary.no_license_cost == 1120
+    assert summary.costs_by_type['OTHER'] == 80
+
+
+def test_mark_stale(database_with_data):
+    """
+    Given a product inserted without the ORM unit of work,
+    When the project is marked as stale and the session commits,
+    Then the summary should include the new product.
+    """
+    db.session.execute(db.insert(Product), [{
+        'name_product': 'bulk_product', 'cost': 5, 'amount': 2, 'license': False, 'type': 'OTHER', 'project_id': 1,
+    }])
+    ProjectCostSummary.mark_stale(1)
+    db.session.commit()
+
+    summary = db.session.get(ProjectCostSummary, 1)
+    assert summary.no_license_cost == 1120
+
+
+def test_for_project_without_summary(database_with_data):
+    """
+    Given a project without a stored cost summary,
+    When I call the for_project method of the ProjectCostSummary class,
+    Then the summary should be computed from the project rows.
+    """
+    db.session.execute(db.delete(ProjectCostSummary))
+    db.session.commit()
+
+    summary = ProjectCostSummary.for_project(1)
+    assert summary.license_cost == 6660
+    assert summary.costs_by_type['SOFTWARE'] == 700
+
+
+def test_for_project_outdated_summary(database_with_data):
+    """
+    Given a project with a summary computed on a previous day,
+    When I call the for_project method of the ProjectCostSummary class,
+    Then the summary should be computed and stored again.
+    """
+    summary = db.session.get(ProjectCostSummary, 1)
+    summary.computed_on = date.today() - timedelta(days=1)
+    db.session.commit()
+
+    assert ProjectCostSummary.for_project(1).computed_on == date.today()
+    assert db.session.get(ProjectCostSummary, 1).computed_on == date.today()
@@ -1,3 +1,5 @@
+from datetime import date, timedelta
+
 from src import db
 from src.models import Project
 
@@ -142,3 +144,95 @@ def test_update_budget(database_with_data):
     assert project.total_cost_members == 6000
     assert project.total_cost_products == 7770
     assert project.budget == 13770
+
+
+def test_apply_cost_delta(database_with_data):
+    """
+    Given a project with an up to date budget,
+    When I call the apply_cost_delta method of the project object,
+    Then the totals and the budget should be adjusted by the given deltas.
+    """
+    project = db.session.get(Project, 1)
+    assert project is not None
+    project.update_budget()
+
+    project.apply_cost_delta(members=600, products=-70)
+    assert project.total_cost_members == 600
+    assert project.total_cost_products == 7700
+    assert project.budget == 8300
+
+
+def test_apply_cost_delta_concurrent_write(database_with_data):
+    """
+    Given a project whose stored totals were changed by another write after it was loaded,
+    When I call the apply_cost_delta method of the project object,
+    Then the deltas should be added to the stored totals.
+    """
+    project = db.session.get(Project, 1)
+    assert project is not None
+    project.update_budget()
+    db.session.commit()
+    db.session.execute(db.update(Project)
+                       .where(Project.id == 1)
+                       .values(total_cost_members=Project.total_cost_members + 100)
+                       .execution_options(synchronize_session=False))
+
+    project.apply_cost_delta(members=600)
+    db.session.commit()
+    assert project.total_cost_members == 700
+    assert project.budget == 8470
+
+
+def test_apply_cost_delta_without_budget(database_with_data):
+    """
+    Given a project whose budget was never calculated,
+    When I call the apply_cost_delta method of the project object,
+    Then the budget should be fully recomputed instead.
+    """
+    project = db.session.get(Project, 1)
+    assert project is not None
+    assert project.total_cost_members is None
+
+    project.apply_cost_delta(members=600)
+    assert project.total_cost_members == 0
+    assert project.total_cost_products == 7770
+    assert project.budget == 7770
+
+
+def test_apply_cost_delta_previous_day(database_with_data):
+    """
+    Given a project whose totals were computed on a previous day,
+    When I call the apply_cost_delta method of the project object,
+    Then the budget should be fully recomputed, the member costs changed since.
+    """
+    project = db.session.get(Project, 1)
+    assert project is not None
+    project.update_budget()
+    project.total_cost_members = 1000
+    project.costs_computed_on = date.today() - timedelta(days=60)
+    db.session.commit()
+
+    project.apply_cost_delta()
+    db.session.commit()
+    assert project.costs_computed_on == date.today()
+    assert project.check_budget() == {}
+
+
+def test_check_budget(database_with_data):
+    """
+    Given a project with a stale budget,
+    When I call the check_budget method of the project object,
+    Then the method should return the stored and expected values of the stale totals.
+    """
+    project = db.session.get(Project, 1)
+    assert project is not None
+    project.update_budget()
+    assert project.check_budget() == {}
+
+    project.members[0].tasks.append(project.tasks[0])
+    db.session.commit()
+
+    assert project.check_budget() == {
+        'total_cost_members': (0, 6000),
+        'budget': (7770, 13770),
+    }
@@ -82,6 +82,24 @@ def test_clean(database_with_data):
     assert db.session.query(Token).count() == 0
 
 
+
+def test_clean_in_batches(database_with_data):
+    """
+    Given more expired tokens than the batch size,
+    When the clean method is called,
+    Then all the expired tokens should be deleted and the valid ones kept.
+    """
+    user = db.session.get(User, 1)
+    expired = datetime.now() - timedelta(days=2)
+    db.session.add_all([Token(user=user, access_token=f'a{i}', access_expiration=expired,
+                              refresh_token=f'r{i}', refresh_expiration=expired) for i in range(5)])
+    token = user.generate_auth_token()
+    db.session.add(token)
+    db.session.commit()
+
+    assert Token.clean(batch_size=2) == 5
+    assert db.session.scalars(db.select(Token)).all() == [token]
+
 def test_from_jwt(database_with_data, tokens):
     """
     Given a token in jwt format,
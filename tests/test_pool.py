@@ -0,0 +1,101 @@
+import inspect
+import logging
+
+from sqlalchemy.pool import QueuePool
+
+from src import create_app, db
+from src.pool import DEFAULT_MAX_OVERFLOW, pool_stats
+
+
+def make_app(tmp_path, **settings):
+    return create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "pool.db"}',
+        'PASSWORD_HASH_WORKERS': 0,
+        'TOKEN_REAPER_INTERVAL': 0,
+        **settings,
+    })
+
+
+def test_pool_stats(tmp_path):
+    """
+    Given a database with a connection pool,
+    When a connection is checked out,
+    Then the pool statistics should report it.
+    """
+    app = make_app(tmp_path, SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 4, 'max_overflow': 2})
+    with app.app_context():
+        with db.engine.connect():
+            stats = pool_stats(db.engine, app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+    assert stats['size'] == 4
+    assert stats['max_overflow'] == 2
+    assert stats['checked_out'] == 1
+    assert stats['overflow'] == 0
+
+
+def test_pool_stats_default_max_overflow(tmp_path):
+    """
+    Given a pool configured without max_overflow,
+    When the pool statistics are requested,
+    Then the maximum overflow should be the QueuePool default.
+    """
+    assert DEFAULT_MAX_OVERFLOW == inspect.signature(QueuePool).parameters['max_overflow'].default
+    app = make_app(tmp_path, SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 4})
+    with app.app_context():
+        assert pool_stats(db.engine, app.config['SQLALCHEMY_ENGINE_OPTIONS'])['max_overflow'] == DEFAULT_MAX_OVERFLOW
+
+
+def test_pool_stats_in_memory(app):
+    """
+    Given an in-memory SQLite database,
+    When the pool statistics are requested,
+    Then nothing should be reported, its pool holds a single connection.
+    """
+    assert pool_stats(db.engine, {}) is None
+
+
+def test_pool_too_small(tmp_path, caplog):
+    """
+    Given a pool that holds fewer connections than WSGI threads,
+    When the app is created,
+    Then a warning should be logged.
+    """
+    with caplog.at_level(logging.WARNING):
+        make_app(tmp_path, WSGI_THREADS=8, SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 2, 'max_overflow': 2})
+    assert 'holds at most 4 connections for 8 WSGI threads' in caplog.text
+
+
+def test_pool_smaller_than_threads(tmp_path, caplog):
+    """
+    Given a pool smaller than the WSGI threads but with enough overflow,
+    When the app is created,
+    Then a warning should suggest a larger pool size.
+    """
+    with caplog.at_level(logging.WARNING):
+        make_app(tmp_path, WSGI_THREADS=8, SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 4, 'max_overflow': 10})
+    assert 'keeps 4 connections open for 8 WSGI threads' in caplog.text
+
+
+def test_pool_unlimited_overflow(tmp_path, caplog):
+    """
+    Given a pool smaller than the WSGI threads without an overflow limit,
+    When the app is created,
+    Then the warning should only suggest a larger pool size.
+    """
+    with caplog.at_level(logging.WARNING):
+        app = make_app(tmp_path, WSGI_THREADS=8, SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 4, 'max_overflow': -1})
+    assert 'keeps 4 connections open for 8 WSGI threads' in caplog.text
+    assert 'holds at most' not in caplog.text
+    with app.app_context():
+        assert db.engine.pool._max_overflow == -1
+
+
+def test_pool_large_enough(tmp_path, caplog):
+    """
+    Given a pool at least as large as the WSGI threads,
+    When the app is created,
+    Then no warning should be logged.
+    """
+    with caplog.at_level(logging.WARNING):
+        make_app(tmp_path, WSGI_THREADS=4, SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 4})
+    assert 'WSGI threads' not in caplog.text
@@ -0,0 +1,60 @@
+import time
+from datetime import datetime, timedelta
+
+from src import create_app, db
+from src.models import Token
+from src.reaper import TokenReaper, TokenReaperState
+
+
+def test_reaper_thread(database_with_data):
+    """
+    Given an expired token,
+    When the token reaper thread runs,
+    Then the token should be deleted in the background.
+    """
+    expired = datetime.now() - timedelta(days=2)
+    db.session.add(Token(user_id=1, access_token='a', access_expiration=expired,
+                         refresh_token='r', refresh_expiration=expired))
+    db.session.commit()
+
+    reaper = TokenReaperState(database_with_data.application, interval=0.01)
+    reaper.start()
+    try:
+        for _ in range(100):
+            if db.session.query(Token).count() == 0:
+                break
+            time.sleep(0.01)
+    finally:
+        reaper.stop()
+
+    assert db.session.query(Token).count() == 0
+
+
+def test_reaper_disabled(app):
+    """
+    Given a reaper interval of 0,
+    When the reaper is initialized,
+    Then no thread should be started.
+    """
+    TokenReaper(app.application)
+    state = app.application.extensions['token_reaper']
+    assert state.interval == 0
+    assert state._thread is None
+
+
+def test_reaper_starts_on_first_request(tmp_path):
+    """
+    Given an app with a reaper interval,
+    When the app is created and then receives its first request,
+    Then the thread should only start with the request.
+    """
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "reaper.db"}',
+                      'PASSWORD_HASH_WORKERS': 0, 'TOKEN_REAPER_INTERVAL': 3600})
+    state = app.extensions['token_reaper']
+    assert state._thread is None
+
+    app.test_client().get('/')
+    try:
+        assert state._thread.is_alive()
+    finally:
+        state.stop()
@@ -0,0 +1,148 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src import create_app, db
+from src.models import Product, Project, ProjectCostSummary, User
+
+
+@pytest.fixture
+def client(tmp_path):
+    """ An app with a primary and a replica database that hold different project names."""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "primary.db"}',
+        'DATABASE_REPLICA_URIS': [f'sqlite:///{tmp_path / "replica.db"}'],
+        'REPLICA_STICKY_SECONDS': 60,
+        'REFRESH_TOKEN_IN_BODY': True,
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'PASSWORD_HASH_WORKERS': 0,
+        'TOKEN_REAPER_INTERVAL': 0,
+    })
+    with app.app_context():
+        for engine, name in ((db.engine, 'primary'), (app.extensions['replicas'].engines[0], 'replica')):
+            db.metadata.create_all(engine)
+            with db.Session(bind=engine) as session:
+                user = User(id=1, username='test1', email='test@test.com', password='test1')
+                session.add(Project(id=1, name_project=name, owner=user, expected_budget=0,
+                                    deadline=date.today() + timedelta(days=60)))
+                session.commit()
+
+    client = app.test_client()
+    response = client.post('api/v1/tokens', auth=('test1', 'test1'))
+    assert response.status_code == 200
+    client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {response.json["access_token"]}'
+    yield client
+
+    with app.app_context():
+        db.session.remove()
+        for engine in [db.engine, *app.extensions['replicas'].engines]:
+            engine.dispose()
+
+
+def test_get_uses_replica(client):
+    """
+    Given a primary database and a replica,
+    When a project is read with a token that only exists in the primary,
+    Then the user should be authenticated and the project read from the replica.
+    """
+    response = client.get('api/v1/projects/1')
+    assert response.status_code == 200
+    assert response.json['name_project'] == 'replica'
+
+    response = client.get('api/v1/projects/1/products_by_type')
+    assert response.status_code == 200
+
+
+def test_write_uses_primary(client):
+    """
+    Given a primary database and a replica,
+    When a project is updated,
+    Then the change should be written to the primary only.
+    """
+    response = client.put('api/v1/projects/1', json={'description_project': 'updated'})
+    assert response.status_code == 200
+    assert response.json['name_project'] == 'primary'
+
+    with client.application.app_context():
+        assert db.session.get(Project, 1).description_project == 'updated'
+        with db.Session(bind=client.application.extensions['replicas'].engines[0]) as session:
+            assert session.get(Project, 1).description_project is None
+
+
+def test_read_your_writes(client):
+    """
+    Given a user that just wrote to the primary,
+    When the user reads within the sticky window,
+    Then the reads should go to the primary until the window is over.
+    """
+    client.put('api/v1/projects/1', json={'description_project': 'updated'})
+
+    response = client.get('api/v1/projects/1')
+    assert response.json['description_project'] == 'updated'
+
+    client.application.extensions['replicas'].sticky_users.clear()
+    response = client.get('api/v1/projects/1')
+    assert response.json['name_project'] == 'replica'
+
+
+def test_bulk_insert_is_sticky(client):
+    """
+    Given a user that just inserted rows without the ORM unit of work,
+    When the user reads within the sticky window,
+    Then the reads should go to the primary and include the new rows.
+    """
+    response = client.post('api/v1/projects/1/members/bulk', json=[
+        {'name_member': 'bulk_member1', 'role': 'test_role', 'salary': 100},
+    ])
+    assert response.status_code == 201
+    client.application.extensions['replicas'].sticky_users.clear()
+
+    # the budget is already computed, only the insert writes to the database
+    response = client.post('api/v1/projects/1/members/bulk', json=[
+        {'name_member': 'bulk_member2', 'role': 'test_role', 'salary': 100},
+    ])
+    assert response.status_code == 201
+
+    response = client.get('api/v1/projects/1/members')
+    assert [member['name_member'] for member in response.json] == ['bulk_member1', 'bulk_member2']
+
+
+def test_cost_summary_stored_from_primary(client):
+    """
+    Given a replica that holds a product missing from the primary and no stored cost summary,
+    When the costs of a project are read,
+    Then the summary should be computed from the primary, stored there and not make the user sticky.
+    """
+    with client.application.app_context():
+        with db.Session(bind=client.application.extensions['replicas'].engines[0]) as session:
+            session.add(Product(name_product='replica_product', cost=100, amount=1, license=False, project_id=1))
+            session.commit()
+            session.execute(db.delete(ProjectCostSummary))
+            session.commit()
+        db.session.execute(db.delete(ProjectCostSummary))
+        db.session.commit()
+
+    response = client.get('api/v1/projects/1/products_by_license')
+    assert response.status_code == 200
+    assert response.json['no_license_cost'] == 0
+
+    with client.application.app_context():
+        assert db.session.get(ProjectCostSummary, 1).no_license_cost == 0
+    assert not client.application.extensions['replicas'].sticky_users
+
+    response = client.get('api/v1/projects/1')
+    assert response.json['name_project'] == 'replica'
+
+
+def test_login_is_not_sticky(client):
+    """
+    Given a user that just logged in,
+    When the user reads,
+    Then the reads should go to the replica, logging in only writes tokens.
+    """
+    response = client.post('api/v1/tokens', auth=('test1', 'test1'))
+    assert response.status_code == 200
+
+    response = client.get('api/v1/projects/1')
+    assert response.json['name_project'] == 'replica'
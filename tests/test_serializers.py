@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from flask import current_app
+
+from src import db
+from src.models import User, Project, Member, Task, Product
+from src.schemas import UserSchema, AllUsersSchema, ProjectSchema, MemberSchema, TaskSchema, ProductSchema
+from src.serializers import compile_dump
+
+SCHEMAS = [
+    (UserSchema, User),
+    (AllUsersSchema, User),
+    (ProjectSchema, Project),
+    (MemberSchema, Member),
+    (TaskSchema, Task),
+    (ProductSchema, Product),
+]
+
+
+def marshmallow_dump(schema, obj, many=None):
+    """ Dump obj with marshmallow only, nested schemas included."""
+    current_app.config['SCHEMA_COMPILED_DUMP'] = False
+    try:
+        return schema.dump(obj, many=many)
+    finally:
+        current_app.config['SCHEMA_COMPILED_DUMP'] = True
+
+
+@pytest.fixture
+def database_with_relationships(database_with_data):
+    """ Add a project budget, task assignments and empty optional columns to the data."""
+    project = db.session.get(Project, 1)
+    task = db.session.get(Task, 1)
+    task.members.extend(db.session.scalars(db.select(Member)).all())
+    task.description_task = None
+    db.session.get(Product, 1).type = None
+    db.session.commit()
+    project.update_budget()
+    db.session.commit()
+    yield database_with_data
+
+
+@pytest.mark.parametrize('schema_class, model', SCHEMAS, ids=[schema.__name__ for schema, _ in SCHEMAS])
+def test_compiled_dump_parity(database_with_relationships, schema_class, model):
+    """
+    Given a schema and every row of its model,
+    When they are dumped by the compiled function and by marshmallow,
+    Then both should produce the same JSON, byte for byte.
+    """
+    schema = schema_class()
+    dump = compile_dump(schema)
+    assert dump is not None
+    rows = db.session.scalars(db.select(model)).all()
+    assert rows
+
+    for row in rows:
+        expected = marshmallow_dump(schema, row)
+        assert json.dumps(dump(row), default=repr) == json.dumps(expected, default=repr)
+        assert database_with_relationships.application.json.dumps(schema.dump(row)) == \
+            database_with_relationships.application.json.dumps(expected)
+
+
+def test_compiled_dump_only(database_with_relationships):
+    """
+    Given a schema restricted with only,
+    When an object is dumped by the compiled function,
+    Then only the selected fields should be dumped, in the same order as marshmallow.
+    """
+    schema = ProjectSchema(only=['id', 'owner', 'budget'])
+    project = db.session.get(Project, 1)
+    assert list(compile_dump(schema)(project).items()) == list(marshmallow_dump(schema, project).items())
+
+
+def test_compiled_dump_many(database_with_relationships):
+    """
+    Given a schema that dumps many objects,
+    When it dumps a list of objects and a list of dicts,
+    Then both should be dumped as marshmallow dumps them.
+    """
+    schema = ProductSchema(many=True)
+    products = db.session.scalars(db.select(Product)).all()
+    assert schema.dump(products) == marshmallow_dump(schema, products)
+
+    rows = [{'id': 1, 'name_product': 'dict'}]
+    assert schema.dump(rows) == marshmallow_dump(schema, rows)
+
+
+def test_compiled_dump_disabled(database_with_relationships):
+    """
+    Given SCHEMA_COMPILED_DUMP disabled,
+    When a schema dumps an object,
+    Then marshmallow should dump it.
+    """
+    schema = MemberSchema()
+    schema._compiled_dump = lambda obj: {'compiled': True}
+    member = db.session.get(Member, 1)
+    assert schema.dump(member) == {'compiled': True}
+    assert marshmallow_dump(schema, member)['name_member'] == 'test_member'
@@ -0,0 +1,49 @@
+from datetime import date
+
+import pytest
+from dateutil import relativedelta
+from sqlalchemy.dialects import mysql
+
+from src import db
+from src.sql import months_between
+
+date_ranges = [
+    (date(2024, 1, 15), date(2024, 7, 15)),
+    (date(2024, 1, 15), date(2024, 7, 14)),
+    (date(2024, 1, 31), date(2024, 2, 29)),
+    (date(2023, 1, 31), date(2023, 2, 28)),
+    (date(2022, 11, 30), date(2023, 2, 28)),
+    (date(2023, 3, 31), date(2023, 4, 30)),
+    (date(2023, 3, 30), date(2023, 4, 29)),
+    (date(2023, 12, 1), date(2025, 1, 1)),
+    (date(2024, 5, 5), date(2024, 5, 5)),
+    (date(2024, 7, 15), date(2024, 1, 14)),
+    (date(2024, 7, 15), date(2024, 1, 16)),
+    (date(2024, 7, 15), date(2024, 7, 10)),
+    (date(2024, 3, 31), date(2024, 2, 29)),
+    (date(2025, 1, 1), date(2023, 12, 31)),
+]
+
+
+@pytest.mark.parametrize('start, end', date_ranges)
+def test_months_between(app_database, start, end):
+    """
+    Given two dates,
+    When the months_between expression is evaluated by the database,
+    Then the result should match the months counted by relativedelta.
+    """
+    delta = relativedelta.relativedelta(end, start)
+    expected = delta.months + (delta.years * 12)
+
+    assert db.session.scalar(db.select(months_between(start, end))) == expected
+
+
+def test_months_between_mysql():
+    """
+    Given the months_between expression,
+    When it is compiled for MySQL,
+    Then the MySQL date functions should be used.
+    """
+    sql = str(db.select(months_between(date(2024, 1, 1), date(2024, 6, 1))).compile(dialect=mysql.dialect()))
+    assert 'LAST_DAY' in sql
+    assert 'MONTH(' in sql
@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+
+# seconds to import src and create the app in a new interpreter
+STARTUP_TIME_BUDGET = float(os.environ.get('STARTUP_TIME_BUDGET') or '2.5')
+
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+from src import create_app
+from src.extensions import af
+app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'TOKEN_REAPER_INTERVAL': 0, 'MAIL_QUEUE_WORKERS': 0})
+print(json.dumps({'seconds': time.perf_counter() - start, 'alembic': 'alembic' in sys.modules,
+                  'apispec': af._apispec is not None}))
+'''
+
+
+def cold_start():
+    root = os.path.join(os.path.dirname(__file__), '..')
+    result = subprocess.run([sys.executable, '-c', CHILD], cwd=root, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_startup_time_budget():
+    """
+    Given a new interpreter,
+    When src is imported and the app is created,
+    Then it should take less than STARTUP_TIME_BUDGET seconds (the best of three runs).
+    """
+    seconds = min(cold_start()['seconds'] for _ in range(3))
+    assert seconds < STARTUP_TIME_BUDGET, f'cold start took {seconds:.2f}s, the budget is {STARTUP_TIME_BUDGET}s'
+
+
+def test_startup_defers_migrations_and_apispec():
+    """
+    Given a new interpreter,
+    When the app is created,
+    Then neither alembic should be imported nor the OpenAPI spec generated.
+    """
+    result = cold_start()
+    assert not result['alembic']
+    assert not result['apispec']